@@ -1,12 +1,23 @@
 '''
 This module calculates the PoyntingVector for a given electromagnetic wave
+
+sympy is only imported once a symbolic expression is requested, so numeric
+callers (poynting_flux.py, plain number inputs) start without paying for it.
 '''
+import importlib
 import math
 import numpy as np
-import sympy as sp
+
+SPEED_OF_LIGHT = 299792458  # speed of light in vacuum (m/s)
+MU_0 = 0.00000125663        # permeability of free space (H/m)
+
+def _sympy():
+    # imports sympy on first use, later calls return the cached module
+    return importlib.import_module('sympy')
 
 def electric_field_expression(e_0, wave_vector, delta, f, polarisation):
     # generates Electric Field
+    sp = _sympy()
     t, x, y, z = sp.symbols('t x y z')  # defining the positon and time variables
     omega = 2 * sp.pi * f   # defining the angular frequenc variable
 
@@ -25,6 +36,7 @@ def electric_field_expression(e_0, wave_vector, delta, f, polarisation):
 
 def magnetic_field_expression(e_0, wave_vector, delta, f, polarisation):
     # generates Magnetic Field
+    sp = _sympy()
     c, t, x, y, z = sp.symbols('c t x y z')
     omega = 2 * sp.pi * f
     r = sp.Matrix([x, y, z])
@@ -45,6 +57,7 @@ def magnetic_field_expression(e_0, wave_vector, delta, f, polarisation):
 
 def poynting_vector_expression(e, b):
     # calculates poynting vector
+    sp = _sympy()
     mu = sp.symbols('mu')
     pv = (1/mu) * e.cross(b)
     # obtaining the algebraic expression for Poynting Vector
@@ -52,9 +65,12 @@ def poynting_vector_expression(e, b):
 
 def poynting_vector_value(e, b, position, time):
     # enumerates poynting vector
+    if not hasattr(e, 'free_symbols') and not hasattr(b, 'free_symbols'):
+        # numeric field vectors need no symbolic substitution
+        return np.cross(np.ravel(e), np.ravel(b)) / MU_0
     pv = poynting_vector_expression(e, b)
     return pv.subs({'x': position[0], 'y': position[1], 'z': position[2],
-                    't': time, 'c' : 299792458, 'mu' : 0.00000125663}).evalf()
+                    't': time, 'c' : SPEED_OF_LIGHT, 'mu' : MU_0}).evalf()
     # returning the numeric value for Poynting Vector
 
 def poynting_vector_magnitude(pv):
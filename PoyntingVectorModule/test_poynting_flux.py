@@ -0,0 +1,83 @@
+'''
+This module runs the unittest for the functions in poynting_flux.py module
+'''
+import unittest
+import numpy as np
+
+from poynting_vector import SPEED_OF_LIGHT, MU_0
+from poynting_flux import (time_averaged_poynting, intensity, poynting_vector_field,
+                           time_averaged_field, plane_surface, sphere_surface,
+                           cylinder_surface, surface_flux)
+
+
+class PoyntingFluxTest(unittest.TestCase):
+    '''
+    Tests for the time averaged Poynting vector and the surface flux integration
+    '''
+
+    def test_time_average_matches_sampled_average(self):
+        '''The analytic average agrees with the sampled average over one period'''
+        e_0, f = 2.0, 5e8
+        wave_vector = [0.0, 0.0, 2 * np.pi * f / SPEED_OF_LIGHT]
+        polarisation = [1.0, 1.0, 0.0]
+        field = poynting_vector_field(e_0, wave_vector, 0.3, f, polarisation)
+        sampled = time_averaged_field(field, 1 / f, num_samples=16)
+        points = np.random.default_rng(0).uniform(-1, 1, (10, 3))
+
+        expected = time_averaged_poynting(e_0, wave_vector, polarisation)
+        np.testing.assert_allclose(sampled(points), np.tile(expected, (10, 1)), rtol=1e-12)
+        self.assertAlmostEqual(intensity(e_0, wave_vector, polarisation),
+                               e_0 ** 2 / (2 * MU_0 * SPEED_OF_LIGHT))
+
+    def test_plane_flux_of_uniform_field(self):
+        '''Flux of a constant vector through a 2 x 3 rectangle'''
+        surface = plane_surface([0, 0, 0], [2, 0, 0], [0, 3, 0])
+        flux, error = surface_flux(lambda p: np.broadcast_to([1.0, 2.0, 4.0], p.shape), surface)
+        self.assertAlmostEqual(flux, 24.0)
+        self.assertLess(error, 1e-9)
+
+    def test_sphere_flux_of_point_source(self):
+        '''Gauss's law for r_hat / r^2 gives 4 pi through any enclosing sphere'''
+        def radial(points):
+            return points / np.linalg.norm(points, axis=-1, keepdims=True) ** 3
+
+        flux, _ = surface_flux(radial, sphere_surface([0, 0, 0], 3.0))
+        self.assertAlmostEqual(flux, 4 * np.pi, places=8)
+        flux, _ = surface_flux(radial, sphere_surface([0.5, 0.2, 0.0], 2.0))
+        self.assertAlmostEqual(flux, 4 * np.pi, places=6)
+
+    def test_cylinder_flux_of_line_source(self):
+        '''A line source rho_hat / rho gives 2 pi per unit length'''
+        def line(points):
+            rho = points.copy()
+            rho[..., 2] = 0.0
+            return rho / np.sum(rho ** 2, axis=-1, keepdims=True)
+
+        flux, _ = surface_flux(line, cylinder_surface([0, 0, -1], [0, 0, 1], 0.5, 2.5))
+        self.assertAlmostEqual(flux, 5 * np.pi, places=8)
+
+    def test_closed_surface_flux_of_plane_wave_vanishes(self):
+        '''The time averaged plane wave carries no net energy into a sphere'''
+        average = time_averaged_poynting(1.0, [0, 0, 1], [1, 0, 0])
+        flux, _ = surface_flux(lambda p: np.broadcast_to(average, p.shape),
+                               sphere_surface([0, 0, 0], 1.0), atol=1e-12)
+        self.assertAlmostEqual(flux, 0.0, places=10)
+
+    def test_zero_net_flux_with_default_tolerances(self):
+        '''A zero-flux closed surface converges quickly with the default arguments'''
+        average = time_averaged_poynting(3.0, [1, 1, 0], [0, 0, 1])
+        calls = []
+
+        def uniform(points):
+            calls.append(points.shape[0])
+            return np.broadcast_to(average, points.shape)
+
+        flux, error = surface_flux(uniform, sphere_surface([0, 0, 0], 2.0))
+        self.assertAlmostEqual(flux, 0.0, places=10)
+        self.assertLess(error, 1e-8)
+        self.assertLess(sum(calls), 10000)
+
+
+if __name__ == '__main__':
+    # running the unit test script
+    unittest.main()
@@ -1,11 +1,22 @@
 '''
 This module runs the unittest for the functions in PoyntingVector.py module 
 '''
+import os
+import subprocess
+import sys
 import unittest
 import sympy as sp
 
 # importing all functions from PoyntingVector module
-from poynting_vector import poynting_vector_value, poynting_vector_magnitude
+from poynting_vector import poynting_vector_value, poynting_vector_magnitude, MU_0
+
+IMPORT_CHECK = '''
+import sys, time
+import numpy
+start = time.perf_counter()
+import poynting_vector, poynting_flux
+print(time.perf_counter() - start, 'sympy' in sys.modules)
+'''
 
 class PoyntingVectorTest(unittest.TestCase):
     # class for the unitest functions
@@ -34,6 +45,25 @@ class PoyntingVectorTest(unittest.TestCase):
 
         assert pv_mag == 5 # asserting the value to the expected result
 
+    def test_numeric_poynting_vector_value(self):
+        """Numeric vectors are crossed directly without sympy."""
+        pv = poynting_vector_value([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 0.0], 0.0)
+        assert list(pv) == [0.0, 0.0, 1 / MU_0]
+
+    def test_import_does_not_load_sympy(self):
+        """
+        Importing the numeric modules in a fresh interpreter (this test module
+        imports sympy itself) leaves sympy unloaded. The import time is
+        reported for reference only, since it varies between machines.
+        """
+        result = subprocess.run([sys.executable, '-c', IMPORT_CHECK],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True)
+        elapsed, sympy_loaded = result.stdout.split()
+        print(f"import of poynting_vector and poynting_flux: {float(elapsed):.3f} s")
+
+        assert sympy_loaded == 'False'
+
 if __name__ == '__main__':
     # running the unit test script
     unittest.main()
@@ -3,8 +3,19 @@ electricSphere uses information generated by the user to
 calculate the electric field at a point in space produced 
 by a sphere with constant charge density placed at another
 point in space.
+
+elec_field_points evaluates the field at many points at once.
+get_qe_table and elec_field_qe_points do the same for a charge
+density that varies with the distance from the center.
+get_field_table precomputes the radial field on a grid for fast
+lookups, and benchmark_field_table compares it with the exact
+functions.
 """
+import time
 import numpy as np
+
+EPS=8.85*10**-12 #permittivity of free space used by the field functions
+
 def get_volume():
     """returns a function defining the volume of the sphere"""
     return lambda r:4/3*np.pi*r**3
@@ -27,6 +38,29 @@ def get_qe():
     """
     return lambda cd,r: get_volume()(r)*cd
 
+def get_qe_table(rho,r,n=4097):
+    """
+    Returns a function defining the charge enclosed within
+    distance s of the center of a sphere of radius r whose
+    charge density rho depends on s. rho is either a function
+    of s accepting arrays or a pair (radii, values) which is
+    interpolated linearly.
+
+    The enclosed charge is integrated once on n points,
+    exactly for rho linear between them, and stored as
+    Q(s)/s**3 so that a constant rho is reproduced exactly.
+    Lookups are vectorized interpolations; beyond r the
+    total charge is returned.
+    """
+    s=np.linspace(0,r,n)
+    rho_s=rho(s) if callable(rho) else np.interp(s,*rho)
+    slope=np.diff(rho_s)/np.diff(s)
+    offset=rho_s[:-1]-slope*s[:-1]
+    shells=4*np.pi*(offset*np.diff(s**3)/3+slope*np.diff(s**4)/4)
+    mean=np.empty(n)
+    mean[0]=4/3*np.pi*rho_s[0]
+    mean[1:]=np.cumsum(shells)/s[1:]**3
+    return lambda x: np.interp(np.minimum(x,r),s,mean)*np.minimum(x,r)**3
 
 def get_vmag(v1):
     """getVMag returns the magnitude of a 3D vector"""
@@ -48,7 +82,6 @@ def inside(r,v1):
 
 def get_field_mag(cd,r,m):
     """getFieldMag returns the magnitude of the electric field"""
-    EPS=8.85*10**-12
     return get_qe()(cd,r)/(EPS*get_area()(m))
 
 def zero_condition(v1):
@@ -66,17 +99,125 @@ def elec_field(o,cd,r,p):
     radius r at point p.
     """
 
-    m=get_vmag(get_sep()(p,o)) #m is the magnitude of the separation vector between p and o
-    r=inside(r,get_sep()(p,o))
+    sep=get_sep()(p,o) #separation vector between p and o
+    m=get_vmag(sep) #m is the magnitude of the separation vector
+    r=min(r,m)
     #if point p is inside the sphere, the radius is
     # reduced to the magnitude of the separation vector
 
-    if len(zero_condition(get_sep()(p,o)))==3:
+    if len(zero_condition(sep))==3:
     #if the separation vector is zero, a 3-dimensional zero vector is returned.
 
         return np.array([0,0,0])
 
-    return get_field_mag(cd,r,m)*get_uvec(get_sep()(p,o),m)
+    return get_field_mag(cd,r,m)*get_uvec(sep,m)
+
+def elec_field_points(o,cd,r,points):
+    """elec_field_points returns the electric field of the
+    sphere described in elec_field at every row of points,
+    an (M,3) array, as an (M,3) array. Inside the sphere the
+    field is cd*s/(3*EPS) for separation vector s, outside it
+    is reduced by (r/m)**3; the center itself gives zero.
+    """
+    sep=np.asarray(points,dtype=float)-np.asarray(o,dtype=float)
+    m=np.sqrt(np.einsum('ij,ij->i',sep,sep))
+    #outside points are masked so that the center never divides by zero
+    outside=m>r
+    scale=np.ones_like(m)
+    scale[outside]=(r/m[outside])**3
+    scale*=cd/(3*EPS)
+    return sep*scale[:,None]
+
+def elec_field_qe_points(o,qe,points):
+    """elec_field_qe_points returns the electric field at every
+    row of points, an (M,3) array, of a spherically symmetric
+    charge centered at o whose enclosed charge within distance
+    s is qe(s), for example a function made by get_qe_table.
+    The center itself gives zero.
+    """
+    sep=np.asarray(points,dtype=float)-np.asarray(o,dtype=float)
+    m=np.sqrt(np.einsum('ij,ij->i',sep,sep))
+    #the center is masked so that it never divides by zero
+    center=m==0
+    scale=np.zeros_like(m)
+    scale[~center]=qe(m[~center])/(4*np.pi*EPS*m[~center]**3)
+    return sep*scale[:,None]
+
+def get_field_table(qe,r,tol=1e-6,n=257):
+    """
+    Returns a function defining the radial electric field at
+    distance s from the center of a spherically symmetric charge
+    of radius r with enclosed charge qe(s), from a lookup table.
+
+    The table starts with n uniform points on [0, r] and the
+    intervals whose midpoint is off by more than tol times the
+    largest field are halved until none are, which puts most
+    points near the surface where the field has a kink. Beyond
+    r all charge is enclosed and the field falls off as 1/s**2.
+    """
+    def exact(x):
+        e=np.zeros_like(x)
+        e[x>0]=qe(x[x>0])/(4*np.pi*EPS*x[x>0]**2)
+        return e
+
+    s=np.linspace(0,r,n)
+    e=exact(s)
+    for _ in range(40):
+        mid=0.5*(s[:-1]+s[1:])
+        e_mid=exact(mid)
+        bad=np.abs(e_mid-0.5*(e[:-1]+e[1:]))>tol*np.max(np.abs(e))
+        if not np.any(bad):
+            break
+        order=np.argsort(np.concatenate([s,mid[bad]]))
+        s=np.concatenate([s,mid[bad]])[order]
+        e=np.concatenate([e,e_mid[bad]])[order]
+    return lambda x: np.where(x<=r,np.interp(x,s,e),e[-1]*(r/np.maximum(x,r))**2)
+
+def elec_field_table_points(o,er,points):
+    """elec_field_table_points returns the electric field at
+    every row of points, an (M,3) array, of a spherically
+    symmetric charge centered at o with radial field er(s),
+    for example a function made by get_field_table.
+    The center itself gives zero.
+    """
+    sep=np.asarray(points,dtype=float)-np.asarray(o,dtype=float)
+    m=np.sqrt(np.einsum('ij,ij->i',sep,sep))
+    #the center is masked so that it never divides by zero
+    center=m==0
+    scale=np.zeros_like(m)
+    scale[~center]=er(m[~center])/m[~center]
+    return sep*scale[:,None]
+
+def benchmark_field_table(cd,r,num_points=10**6,tol=1e-6):
+    """
+    benchmark_field_table compares the field of a sphere at
+    origin with charge density cd and radius r at num_points
+    random points, computed by elec_field (on a sample of 1000
+    points), elec_field_points and the lookup table. It returns
+    a dictionary of points per second for 'elec_field',
+    'points' and 'table', the time to build the table
+    'table_setup' and the largest field error of the table
+    relative to the largest field, 'table_error'.
+    """
+    o=np.zeros(3)
+    points=np.random.default_rng(0).normal(size=(num_points,3))*r
+    start=time.perf_counter()
+    for p in points[:1000]:
+        elec_field(o,cd,r,p)
+    report={"elec_field":1000/(time.perf_counter()-start)}
+
+    start=time.perf_counter()
+    exact=elec_field_points(o,cd,r,points)
+    report["points"]=num_points/(time.perf_counter()-start)
+
+    start=time.perf_counter()
+    er=get_field_table(lambda s: get_qe()(cd,np.minimum(s,r)),r,tol)
+    report["table_setup"]=time.perf_counter()-start
+    start=time.perf_counter()
+    table=elec_field_table_points(o,er,points)
+    report["table"]=num_points/(time.perf_counter()-start)
+    report["table_error"]=np.max(np.abs(table-exact))/np.max(np.abs(exact))
+    return report
 
 def get_field(o,cd,r,p):
     """
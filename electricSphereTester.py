@@ -4,7 +4,9 @@ the electricSphere module is functioning as intended
 """
 import unittest
 import numpy as np
-from electricSphere import get_vmag, elec_field, inside, zero_condition
+from electricSphere import (EPS, get_vmag, elec_field, inside, zero_condition, elec_field_points,
+                            get_qe_table, elec_field_qe_points, get_field_table,
+                            elec_field_table_points, benchmark_field_table)
 
 class TestElectricFieldCalculations(unittest.TestCase):
     """
@@ -167,6 +169,71 @@ class TestElectricFieldCalculations(unittest.TestCase):
         assert len(zero_condition(v))==1
         v=([1,1,1])
         assert len(zero_condition(v))==0
+    def test_points(self):
+        """test_points tests whether or not elec_field_points
+        agrees with elec_field inside, outside and at the center
+        of a sphere that is not at the origin
+        """
+        o=np.array([1,-2,0.5])
+        rng=np.random.default_rng(0)
+        points=np.vstack([o,o+rng.normal(size=(200,3))*4])
+        ef=elec_field_points(o,2,3,points)
+        for i,p in enumerate(points):
+            np.testing.assert_allclose(ef[i],elec_field(o,2,3,p),rtol=1e-12)
+
+    def test_points_many(self):
+        """test_points_many tests whether or not a million
+        points in one call match the closed-form radial field
+        inside and outside the sphere
+        """
+        points=np.random.default_rng(1).normal(size=(10**6,3))
+        s=np.linalg.norm(points,axis=1)
+        expected=np.where(s<=1,s,1/s**2)/(3*EPS)
+        ef=elec_field_points(np.zeros(3),1,1,points)
+        np.testing.assert_allclose(np.linalg.norm(ef,axis=1),expected,rtol=1e-12)
+        np.testing.assert_allclose(np.sum(ef*points,axis=1),expected*s,rtol=1e-12)
+    def test_qe_table(self):
+        """test_qe_table tests whether or not the enclosed charge
+        table reproduces a constant density exactly and a density
+        rising linearly with the radius, given as a table
+        """
+        s=np.linspace(0,3,50)
+        qe=get_qe_table(lambda x: np.full_like(x,2.0),2)
+        np.testing.assert_allclose(qe(s),4/3*np.pi*np.minimum(s,2)**3*2,rtol=1e-12)
+        qe=get_qe_table(([0,2],[0,4]),2)
+        np.testing.assert_allclose(qe(s),np.pi*2*np.minimum(s,2)**4,rtol=1e-12,atol=1e-15)
+
+    def test_qe_points(self):
+        """test_qe_points tests whether or not elec_field_qe_points
+        agrees with elec_field_points for a constant density
+        """
+        o=np.array([1,0,-1])
+        points=np.vstack([o,np.random.default_rng(2).normal(size=(100,3))*3])
+        qe=get_qe_table(lambda x: np.full_like(x,1.5),2)
+        np.testing.assert_allclose(elec_field_qe_points(o,qe,points),
+                                   elec_field_points(o,1.5,2,points),rtol=1e-12)
+    def test_field_table(self):
+        """test_field_table tests whether or not the radial lookup
+        table stays within its tolerance of the exact field for a
+        density rising with the square of the radius, inside and
+        outside the sphere
+        """
+        def qe(x):
+            return np.minimum(x,2)**5
+        er=get_field_table(qe,2,tol=1e-7)
+        points=np.random.default_rng(3).normal(size=(10000,3))*2
+        exact=elec_field_qe_points(np.zeros(3),qe,points)
+        table=elec_field_table_points(np.zeros(3),er,points)
+        assert np.max(np.abs(table-exact))<=2e-7*np.max(np.abs(exact))
+
+    def test_benchmark_field_table(self):
+        """test_benchmark_field_table tests whether or not the
+        benchmark reports rates for every method and a small error
+        """
+        report=benchmark_field_table(1,2,num_points=10000)
+        for key in ("elec_field","points","table"):
+            assert report[key]>0
+        assert report["table_error"]<1e-6
 
 if __name__=="__main__":
     unittest.main()
@@ -0,0 +1,145 @@
+"""
+electric_sphere_batch computes the electric field of a uniformly
+charged sphere (see electricSphere) at every point of a file.
+
+The point file, either a .npy array of shape (M,3) or raw float64
+x,y,z triples, is memory-mapped and processed in chunks with
+elec_field_points, so memory use stays at one chunk and no point is
+formatted as text unless CSV output is requested. Results are written
+as .npy (memory-mapped), raw float64 or CSV, and a progress line and a
+final throughput report go to standard error.
+
+Usage:
+    python electric_sphere_batch.py points.npy fields.npy \\
+        --origin 0 0 0 --charge-density 1 --radius 5
+"""
+import argparse
+import os
+import sys
+import time
+from functools import partial
+import numpy as np
+from electricSphere import elec_field_points
+
+CHUNK_POINTS = 2**20 #points processed per chunk
+FORMATS = ("npy","raw","csv")
+
+def open_points(path):
+    """
+    open_points memory-maps a point file: a .npy array of
+    shape (M,3), or any other file as raw float64 triples.
+    An empty raw file holds no points.
+    """
+    if str(path).endswith(".npy"):
+        points=np.load(path,mmap_mode="r")
+    elif os.path.getsize(path)==0:
+        #an empty file cannot be memory-mapped
+        points=np.empty((0,3))
+    else:
+        points=np.memmap(path,dtype="<f8",mode="r")
+        if points.size%3:
+            raise ValueError("Raw point files must hold x,y,z float64 triples.")
+        points=points.reshape(-1,3)
+    if points.ndim!=2 or points.shape[1]!=3:
+        raise ValueError("Point arrays must have shape (M,3).")
+    return points
+
+def _write_npy(out,start,fields):
+    """_write_npy copies fields into the memory-mapped output"""
+    out[start:start+len(fields)]=fields
+
+def _write_raw(handle,_,fields):
+    """_write_raw appends fields to a binary file as float64"""
+    np.ascontiguousarray(fields,dtype="<f8").tofile(handle)
+
+def _write_csv(handle,_,fields):
+    """_write_csv appends fields to a text file as CSV rows"""
+    np.savetxt(handle,fields,delimiter=",",fmt="%.17g")
+
+def _output_writer(path,fmt,num_points):
+    """_output_writer returns write(start, fields) and close()
+    for the requested output format
+    """
+    if fmt=="npy":
+        out=np.lib.format.open_memmap(path,mode="w+",dtype="<f8",shape=(num_points,3))
+        return partial(_write_npy,out),out.flush
+    if fmt=="raw":
+        handle=open(path,"wb") # pylint: disable=consider-using-with
+        return partial(_write_raw,handle),handle.close
+    handle=open(path,"w",encoding="utf-8") # pylint: disable=consider-using-with
+    handle.write("ex,ey,ez\n")
+    return partial(_write_csv,handle),handle.close
+
+def batch_fields(points,output,sphere,options=None):
+    """
+    batch_fields writes the field of the sphere, a dictionary
+    with "origin", "charge density" and "radius", at every row
+    of points to the file output. options is an optional
+    dictionary of "format" (one of FORMATS, default "npy"),
+    "chunk" (points per chunk) and "progress", a text stream
+    that receives one line per chunk.
+    It returns a report dictionary of "points", "seconds",
+    "points_per_second" and "bytes_per_second" (input plus output).
+    """
+    settings={"format":"npy","chunk":CHUNK_POINTS,"progress":None}
+    settings.update(options or {})
+    if settings["format"] not in FORMATS:
+        raise ValueError(f"Output format must be one of {FORMATS}.")
+    if settings["chunk"]<1:
+        raise ValueError("Chunk size must be at least 1.")
+    chunk,progress=settings["chunk"],settings["progress"]
+    write,close=_output_writer(output,settings["format"],len(points))
+    start_time=time.perf_counter()
+    try:
+        for start in range(0,len(points),chunk):
+            fields=elec_field_points(sphere["origin"],sphere["charge density"],
+                                     sphere["radius"],points[start:start+chunk])
+            write(start,fields)
+            if progress is not None:
+                done=start+len(fields)
+                rate=done/max(time.perf_counter()-start_time,1e-12)
+                progress.write(f"{done}/{len(points)} points, {rate:.3e} points/s\n")
+    finally:
+        close()
+    seconds=time.perf_counter()-start_time
+    return {"points":len(points),"seconds":seconds,
+            "points_per_second":len(points)/max(seconds,1e-12),
+            "bytes_per_second":2*24*len(points)/max(seconds,1e-12)}
+
+def _positive_int(text):
+    """_positive_int converts a command line value to an
+    integer of at least 1
+    """
+    value=int(text)
+    if value<1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def main(argv=None):
+    """
+    main parses the command line, runs batch_fields and
+    prints the throughput report to standard error
+    """
+    parser=argparse.ArgumentParser(description="Electric field of a charged sphere at many points.")
+    parser.add_argument("points",help=".npy (M,3) array or raw float64 x,y,z file")
+    parser.add_argument("output",help="output file")
+    parser.add_argument("--origin",type=float,nargs=3,default=[0.0,0.0,0.0])
+    parser.add_argument("--charge-density",type=float,default=1.0)
+    parser.add_argument("--radius",type=float,default=1.0)
+    parser.add_argument("--format",choices=FORMATS,default="npy")
+    parser.add_argument("--chunk",type=_positive_int,default=CHUNK_POINTS,help="points per chunk")
+    parser.add_argument("--quiet",action="store_true",help="no progress lines")
+    args=parser.parse_args(argv)
+
+    sphere={"origin":np.array(args.origin),"charge density":args.charge_density,
+            "radius":args.radius}
+    options={"format":args.format,"chunk":args.chunk,
+             "progress":None if args.quiet else sys.stderr}
+    report=batch_fields(open_points(args.points),args.output,sphere,options)
+    sys.stderr.write(f"{report['points']} points in {report['seconds']:.3f} s: "
+                     f"{report['points_per_second']:.3e} points/s, "
+                     f"{report['bytes_per_second']/1e6:.1f} MB/s\n")
+    return report
+
+if __name__=="__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Unit tests for boris_tracker.py"""
+
+import math
+import numpy as np
+from boris_tracker import boris_push, track_particles
+
+CHARGE = 1.6e-19  # Coulombs
+MASS = 1.67e-27   # kg (proton)
+
+
+def test_gyration_conserves_energy_and_returns_to_start():
+    """Test a full cyclotron period in a uniform magnetic field."""
+    magnetic_field = np.array([0.0, 0.0, 1.0])
+    period = 2 * math.pi * MASS / (CHARGE * magnetic_field[2])
+    velocity = np.array([[1e5, 0.0, 0.0], [0.0, 2e5, 1e4]])
+
+    particles = {'position': np.zeros((2, 3)), 'velocity': velocity,
+                 'charge': CHARGE, 'mass': MASS}
+
+    result = track_particles(particles, period / 2000, 2000, {'magnetic': magnetic_field},
+                             options={'analytic': False})
+
+    position = result['particles']['position']
+    np.testing.assert_allclose(position[:, :2], 0.0, atol=1e-6)
+    np.testing.assert_allclose(position[1, 2], 1e4 * period, rtol=1e-9)
+    np.testing.assert_array_equal(particles['position'], 0.0)
+    assert result['energy_drift'] < 1e-12
+
+
+def test_exb_drift_velocity():
+    """Test that the guiding centre drifts with E x B / B^2."""
+    electric_field = np.array([1e3, 0.0, 0.0])
+    magnetic_field = np.array([0.0, 0.0, 0.5])
+    period = 2 * math.pi * MASS / (CHARGE * 0.5)
+    drift = np.cross(electric_field, magnetic_field) / 0.25
+
+    particles = {'position': np.zeros((1, 3)), 'velocity': drift[None, :],
+                 'charge': CHARGE, 'mass': MASS}
+
+    result = track_particles(particles, period / 500, 5000,
+                             {'electric': electric_field, 'magnetic': magnetic_field},
+                             options={'analytic': False})
+    np.testing.assert_allclose(result['particles']['velocity'][0], drift, rtol=1e-9, atol=1e-6)
+
+
+def test_energy_drift_from_rest_in_electric_field():
+    """Test a finite drift for particles that start with zero total energy."""
+    particles = {'position': np.zeros((2, 3)), 'velocity': np.zeros((2, 3)),
+                 'charge': CHARGE, 'mass': MASS}
+    result = track_particles(particles, 1e-9, 100, {'electric': [1e3, 0.0, 0.0]},
+                             options={'analytic': False, 'stride': 100})
+    np.testing.assert_allclose(result['energy_drift'], 0.01)
+
+
+def test_per_particle_time_steps_and_callable_fields():
+    """Test array time steps and a field given as a function of position."""
+    particles = {'position': np.zeros((2, 3)), 'velocity': np.zeros((2, 3)),
+                 'charge': CHARGE, 'mass': MASS}
+    fields = {'electric': lambda x, t: np.tile([1.0, 0.0, 0.0], (len(x), 1))}
+
+    boris_push(particles, np.array([1e-9, 2e-9]), fields)
+    np.testing.assert_allclose(particles['velocity'][:, 0],
+                               CHARGE / MASS * np.array([1e-9, 2e-9]))
+
+
+def test_trajectory_files_are_recorded_with_stride(tmp_path):
+    """Test the on-disk trajectory written every stride steps."""
+    particles = {'position': np.zeros((3, 3)), 'velocity': np.array([[1e5, 0.0, 0.0]] * 3),
+                 'charge': CHARGE, 'mass': MASS}
+    result = track_particles(particles, 1e-10, 10, {'magnetic': [0.0, 0.0, 1.0]},
+                             options={'stride': 4, 'output': tmp_path})
+
+    positions = np.load(tmp_path / 'positions.npy', mmap_mode='r')
+    times = np.load(tmp_path / 'times.npy')
+    assert positions.shape == (3, 3, 3)
+    np.testing.assert_allclose(times, [0.0, 4e-10, 8e-10])
+    assert result['trajectory'] == tmp_path
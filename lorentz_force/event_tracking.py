@@ -0,0 +1,253 @@
+"""
+This module tracks charged particles until they hit a boundary, such as a
+detector wall, a beam pipe or an aperture.
+
+Every particle carries its own time and time step. The Boris step is
+used in its drift-kick-drift form, which keeps positions and velocities
+at the same time, as the Hermite interpolation below needs. Each
+iteration makes a full step and two half steps for all active particles
+at once; the difference between the two results estimates the local
+error relative to the distance travelled. Particles whose error is within tolerance accept
+the more accurate half-step result, and every step size is rescaled by
+the error estimate, all through boolean masks.
+
+Boundaries are functions g(position) -> (N,) that are negative inside the
+allowed region. When g changes sign during an accepted step, the crossing
+is located by batched bisection on the cubic Hermite curve through the
+start and end states of the step, which gives the event time, position
+and velocity. Particles that hit a boundary or reach the end time are
+removed from the active arrays, so later iterations work on fewer
+particles.
+"""
+
+import numpy as np
+from boris_tracker import boris_push
+
+BISECTION_STEPS = 52  # halvings of the step fraction, down to double precision
+
+
+def plane_boundary(point, normal):
+    """Returns g for the plane through point; the normal points out of the region."""
+    point = np.asarray(point, dtype=float)
+    normal = np.asarray(normal, dtype=float) / np.linalg.norm(normal)
+    return lambda x: (x - point) @ normal
+
+
+def sphere_boundary(center, radius):
+    """Returns g for the inside of a sphere."""
+    center = np.asarray(center, dtype=float)
+    return lambda x: np.linalg.norm(x - center, axis=-1) - radius
+
+
+def cylinder_boundary(point, axis, radius):
+    """Returns g for the inside of an infinite cylinder (pipe or aperture)."""
+    point = np.asarray(point, dtype=float)
+    axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+
+    def boundary(x):
+        offset = x - point
+        return np.linalg.norm(offset - (offset @ axis)[..., None] * axis, axis=-1) - radius
+
+    return boundary
+
+
+def _hermite(start, end, dt, s):
+    # cubic Hermite position and velocity at step fractions s, shape (n,)
+    s = s[:, None]
+    span = dt[:, None]
+    position = ((2 * s**3 - 3 * s**2 + 1) * start['position']
+                + (s**3 - 2 * s**2 + s) * span * start['velocity']
+                + (3 * s**2 - 2 * s**3) * end['position']
+                + (s**3 - s**2) * span * end['velocity'])
+    velocity = ((6 * s**2 - 6 * s) * (start['position'] - end['position']) / span
+                + (3 * s**2 - 4 * s + 1) * start['velocity']
+                + (3 * s**2 - 2 * s) * end['velocity'])
+    return position, velocity
+
+
+def _bisect(boundary, start, end, dt):
+    # smallest step fraction with boundary >= 0, assuming g(0) < 0 <= g(1)
+    low = np.zeros(len(dt))
+    high = np.ones(len(dt))
+    for _ in range(BISECTION_STEPS):
+        middle = 0.5 * (low + high)
+        inside = boundary(_hermite(start, end, dt, middle)[0]) < 0
+        low = np.where(inside, middle, low)
+        high = np.where(inside, high, middle)
+    return high
+
+
+def _synchronised_push(state, dt, fields, time):
+    # drift-kick-drift form of the Boris step, leaving x and v at the same time
+    state['position'] += 0.5 * dt[:, None] * state['velocity']
+    boris_push(state, dt, fields, time=time + 0.5 * dt)
+    state['position'] -= 0.5 * dt[:, None] * state['velocity']
+
+
+def _step_pair(active, dt, fields):
+    # one full step and two half steps from the same start
+    full = {key: active[key].copy() for key in ('position', 'velocity', 'charge', 'mass')}
+    half = {key: active[key].copy() for key in ('position', 'velocity', 'charge', 'mass')}
+    _synchronised_push(full, dt, fields, active['time'])
+    _synchronised_push(half, 0.5 * dt, fields, active['time'])
+    _synchronised_push(half, 0.5 * dt, fields, active['time'] + 0.5 * dt)
+    return full, half
+
+
+def _crossings(boundaries, active, end, dt, accepted):
+    # event step fraction (inf if none) and boundary id for every particle
+    fraction = np.full(len(dt), np.inf)
+    hit = np.full(len(dt), -1)
+    for boundary_id, boundary in enumerate(boundaries):
+        crossing = accepted & (boundary(end['position']) >= 0)
+        if np.any(crossing):
+            start = {key: active[key][crossing] for key in ('position', 'velocity')}
+            stop = {key: end[key][crossing] for key in ('position', 'velocity')}
+            found = _bisect(boundary, start, stop, dt[crossing])
+            earlier = found < fraction[crossing]
+            rows = np.flatnonzero(crossing)[earlier]
+            fraction[rows] = found[earlier]
+            hit[rows] = boundary_id
+    return fraction, hit
+
+
+def _adaptive_step(active, dt, fields, settings):
+    # half-step result, acceptance mask and step size factor from step doubling
+    full, half = _step_pair(active, dt, fields)
+    scale = settings['rtol'] * np.maximum(np.linalg.norm(active['velocity'], axis=1) * dt,
+                                          np.finfo(float).tiny)
+    error = np.linalg.norm(full['position'] - half['position'], axis=1) / scale
+    accepted = (error <= 1) | (dt <= settings['dt_min'])
+    with np.errstate(divide='ignore'):
+        factor = np.clip(0.9 * error ** -0.5, 0.2, 5.0)
+    return half, accepted, factor
+
+
+def _event_states(active, end, dt, fraction, hit):
+    # interpolated event records; the end states of hitting particles move to the event
+    event = hit >= 0
+    start = {key: active[key][event] for key in ('position', 'velocity')}
+    stop = {key: end[key][event] for key in ('position', 'velocity')}
+    position, velocity = _hermite(start, stop, dt[event], fraction[event])
+    end['position'][event] = position
+    end['velocity'][event] = velocity
+    return {'index': active['index'][event],
+            'time': active['time'][event] + fraction[event] * dt[event],
+            'position': position, 'velocity': velocity, 'boundary': hit[event]}
+
+
+def _starting_hits(boundaries, position):
+    # first boundary every particle already touches at the start, or -1
+    hit = np.full(len(position), -1)
+    for boundary_id, boundary in reversed(list(enumerate(boundaries))):
+        hit[boundary(position) >= 0] = boundary_id
+    return hit
+
+
+def _active_fields(fields, index):
+    # per-particle (N, 3) field arrays restricted to the active particles
+    return {name: field[index] if not callable(field) and np.ndim(field) == 2 else field
+            for name, field in (fields or {}).items()}
+
+
+def _initial_state(particles, settings):
+    # per-particle result arrays and the active arrays, which shrink as particles finish
+    num_particles = len(particles['position'])
+    result = {
+        'position': np.array(particles['position'], dtype=float),
+        'velocity': np.array(particles['velocity'], dtype=float),
+        'time': np.zeros(num_particles),
+        'status': np.full(num_particles, -2)
+    }
+    active = {
+        'position': result['position'].copy(),
+        'velocity': result['velocity'].copy(),
+        'charge': np.broadcast_to(np.asarray(particles['charge'], dtype=float), (num_particles,)),
+        'mass': np.broadcast_to(np.asarray(particles['mass'], dtype=float), (num_particles,)),
+        'time': np.zeros(num_particles),
+        'dt': np.full(num_particles, settings['dt_initial']),
+        'index': np.arange(num_particles)
+    }
+    return result, active
+
+
+def _locate_events(boundaries, active, step, dt, events):
+    # boundary hit per particle (-1 if none) and the step lengths cut back to the
+    # crossings; the interpolated event records are appended to events
+    half, accepted, _ = step
+    fraction, hit = _crossings(boundaries, active, half, dt, accepted)
+    event = hit >= 0
+    if np.any(event):
+        events.append(_event_states(active, half, dt, fraction, hit))
+        dt = np.where(event, fraction * dt, dt)
+    return hit, dt
+
+
+def _apply_step(active, step, dt, settings):
+    # keep the accepted half-step results, advance their times and rescale every step
+    half, accepted, factor = step
+    for key in ('position', 'velocity'):
+        active[key] = np.where(accepted[:, None], half[key], active[key])
+    active['time'] = np.where(accepted, active['time'] + dt, active['time'])
+    active['dt'] = np.clip(active['dt'] * factor, settings['dt_min'], settings['dt_max'])
+
+
+def _retire(result, active, finished, hit):
+    # store the finished particles with their boundary id (-1 for t_end) and
+    # return the active arrays of the others
+    done = active['index'][finished]
+    for key in ('position', 'velocity', 'time'):
+        result[key][done] = active[key][finished]
+    result['status'][done] = np.where(hit[finished] >= 0, hit[finished], -1)
+    return {key: value[~finished] for key, value in active.items()}
+
+
+def track_until_events(particles, t_end, boundaries, fields=None, tolerances=None):
+    """
+    Track particles with adaptive steps until they hit a boundary or t_end.
+
+    Args:
+        particles: initial state as described in boris_tracker.boris_push
+        t_end: final time (s)
+        boundaries: list of functions g(position) -> (N,), negative inside
+        fields: see boris_tracker.field_at; callables receive per-particle times
+            and per-particle (N, 3) arrays follow the remaining particles
+        tolerances: optional dictionary with 'rtol' (local position error
+            relative to the step length, default 1e-6), 'dt_initial',
+            'dt_min', 'dt_max' (s) and 'max_iterations'
+
+    Returns:
+        Dictionary with one entry per particle: 'position', 'velocity' and
+        'time' at the end of its track and 'status' (boundary id, -1 for
+        reaching t_end, -2 if max_iterations ran out), plus 'events', a
+        dictionary of 'index', 'time', 'position', 'velocity' and 'boundary'
+        for every boundary hit, and the number of 'iterations'
+    """
+    settings = {'rtol': 1e-6, 'dt_initial': t_end / 100, 'dt_min': t_end * 1e-12,
+                'dt_max': t_end, 'max_iterations': 100000}
+    settings.update(tolerances or {})
+    result, active = _initial_state(particles, settings)
+
+    # particles starting on or beyond a boundary retire at once
+    hit = _starting_hits(boundaries, active['position'])
+    finished = hit >= 0
+    events = [{'index': np.flatnonzero(finished), 'time': np.zeros(np.sum(finished)),
+               'position': active['position'][finished],
+               'velocity': active['velocity'][finished],
+               'boundary': hit[finished]}]
+    active = _retire(result, active, finished, hit)
+
+    iterations = 0
+    while len(active['index']) and iterations < settings['max_iterations']:
+        iterations += 1
+        dt = np.minimum(active['dt'], t_end - active['time'])
+        step = _adaptive_step(active, dt, _active_fields(fields, active['index']), settings)
+        hit, dt = _locate_events(boundaries, active, step, dt, events)
+        _apply_step(active, step, dt, settings)
+        active = _retire(result, active, (hit >= 0) | (active['time'] >= t_end), hit)
+
+    for key in ('position', 'velocity', 'time'):
+        result[key][active['index']] = active[key]
+    result['events'] = {key: np.concatenate([e[key] for e in events]) for key in events[0]}
+    result['iterations'] = iterations
+    return result
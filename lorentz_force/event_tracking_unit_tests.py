@@ -0,0 +1,70 @@
+"""Unit tests for event_tracking.py"""
+
+import math
+import numpy as np
+from event_tracking import (plane_boundary, sphere_boundary, cylinder_boundary,
+                            track_until_events)
+
+CHARGE = 1.6e-19  # Coulombs
+MASS = 1.67e-27   # kg (proton)
+
+
+def test_straight_line_hits_plane():
+    """Test the event of free particles crossing a wall at x = 1 m."""
+    particles = {'position': np.zeros((2, 3)),
+                 'velocity': np.array([[1e5, 0.0, 0.0], [2e5, 1e5, 0.0]]),
+                 'charge': CHARGE, 'mass': MASS}
+    result = track_until_events(particles, 1e-4, [plane_boundary([1, 0, 0], [1, 0, 0])])
+
+    events = result['events']
+    order = np.argsort(events['index'])
+    np.testing.assert_allclose(events['time'][order], [1e-5, 5e-6], rtol=1e-12)
+    np.testing.assert_allclose(events['position'][order][:, 0], 1.0, rtol=1e-12)
+    np.testing.assert_array_equal(result['status'], [0, 0])
+
+
+def test_gyrating_particle_hits_pipe_wall():
+    """Test the hit time of a gyrating proton on a pipe narrower than its orbit."""
+    b_field, speed, radius = 1.0, 1e5, 1e-3
+    omega = CHARGE * b_field / MASS
+    larmor = speed / omega
+    particles = {'position': np.zeros((1, 3)), 'velocity': np.array([[speed, 0.0, 0.0]]),
+                 'charge': CHARGE, 'mass': MASS}
+
+    result = track_until_events(particles, 1e-6, [cylinder_boundary([0, 0, 0], [0, 0, 1], radius)],
+                                {'magnetic': np.array([0.0, 0.0, b_field])},
+                                {'rtol': 1e-8})
+
+    expected = 2 / omega * math.asin(radius / (2 * larmor))
+    assert math.isclose(result['events']['time'][0], expected, rel_tol=1e-5)
+    assert math.isclose(np.linalg.norm(result['position'][0, :2]), radius, rel_tol=1e-9)
+
+
+def test_survivors_and_particles_starting_outside():
+    """Test the status of particles that survive, hit, or start outside."""
+    particles = {'position': np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [2.0, 0.0, 0.0]]),
+                 'velocity': np.array([[1e5, 0.0, 0.0], [1e3, 0.0, 0.0], [0.0, 0.0, 0.0]]),
+                 'charge': CHARGE, 'mass': MASS}
+    boundaries = [sphere_boundary([0, 0, 0], 1.0), plane_boundary([0, 0, 5], [0, 0, 1])]
+    result = track_until_events(particles, 1e-4, boundaries)
+
+    np.testing.assert_array_equal(result['status'], [0, -1, 0])
+    np.testing.assert_allclose(result['time'], [1e-5, 1e-4, 0.0], rtol=1e-12)
+    np.testing.assert_allclose(result['position'][1], [0.1, 0.0, 0.0], rtol=1e-12)
+    assert sorted(result['events']['index']) == [0, 2]
+
+
+def test_per_particle_fields_follow_retirement():
+    """Test per-particle (N, 3) fields after the first particle retires early."""
+    speed = 1e5
+    particles = {'position': np.zeros((2, 3)), 'velocity': np.array([[speed, 0.0, 0.0]] * 2),
+                 'charge': CHARGE, 'mass': MASS}
+    fields = {'magnetic': np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 1.0]])}
+    result = track_until_events(particles, 1e-7, [plane_boundary([5e-3, 0, 0], [1, 0, 0])],
+                                fields)
+
+    np.testing.assert_array_equal(result['status'], [0, -1])
+    assert math.isclose(result['events']['time'][0], 5e-8, rel_tol=1e-9)
+    larmor = speed * MASS / CHARGE
+    radius = np.linalg.norm(result['position'][1] - [0.0, -larmor, 0.0])
+    assert math.isclose(radius, larmor, rel_tol=1e-5)
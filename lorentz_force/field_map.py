@@ -0,0 +1,117 @@
+"""
+This module provides gridded electric or magnetic field maps for the
+particle trackers.
+
+A FieldMap holds field vectors sampled on a regular 3D grid,
+
+    data[i, j, k] = F(origin + (i, j, k) * spacing),   shape (nx, ny, nz, 3)
+
+and interpolates them at N particle positions at once, either trilinearly
+(8 grid points per particle) or with tricubic Catmull-Rom weights
+(64 grid points per particle). Grids saved as .npy files are memory-mapped,
+so only the pages touched by the particles are read from disk.
+
+Particles usually stay in the same grid cell from one step to the next,
+so the map remembers the last cell of every particle and only recomputes
+the cells of the particles that left theirs.
+
+A FieldMap is called as field(position, time), so it can be used directly
+as the 'electric' or 'magnetic' entry of the fields in boris_tracker.
+"""
+
+import numpy as np
+
+
+def _cubic_weights(t):
+    # Catmull-Rom weights of the grid points i-1, i, i+1, i+2, shape (N, 4)
+    t_2 = t * t
+    t_3 = t_2 * t
+    return np.stack([0.5 * (-t_3 + 2 * t_2 - t),
+                     0.5 * (3 * t_3 - 5 * t_2 + 2),
+                     0.5 * (-3 * t_3 + 4 * t_2 + t),
+                     0.5 * (t_3 - t_2)], axis=1)
+
+
+class FieldMap:
+    """
+    Vector field sampled on a regular grid.
+
+    Args:
+        data: array of shape (nx, ny, nz, 3) with at least 2 points per axis
+        origin: position of data[0, 0, 0] (m)
+        spacing: grid spacing along x, y and z (m), scalar or shape (3,)
+        method: 'linear' (trilinear) or 'cubic' (tricubic Catmull-Rom)
+        fill_value: field returned outside the grid
+    """
+
+    def __init__(self, data, origin, spacing, method='linear', fill_value=0.0):
+        if data.ndim != 4 or data.shape[3] != 3 or min(data.shape[:3]) < 2:
+            raise ValueError("Field data must have shape (nx, ny, nz, 3) with n >= 2.")
+        if method not in ('linear', 'cubic'):
+            raise ValueError("method must be 'linear' or 'cubic'.")
+        self.data = data
+        self.origin = np.asarray(origin, dtype=float)
+        self.spacing = np.broadcast_to(np.asarray(spacing, dtype=float), (3,))
+        self.method = method
+        self.fill_value = fill_value
+        self._cells = None
+
+    @classmethod
+    def load(cls, path, origin, spacing, method='linear', fill_value=0.0):
+        """Memory-map a field map stored with np.save."""
+        return cls(np.load(path, mmap_mode='r'), origin, spacing, method, fill_value)
+
+    def cell_indices(self, position):
+        """
+        Grid coordinates of the positions and the lower corner of their cells.
+
+        Returns:
+            Tuple (coordinates, cells, inside) with float coordinates (N, 3),
+            integer cells (N, 3) and a boolean mask (N,) of in-grid points
+        """
+        coordinates = (np.asarray(position, dtype=float) - self.origin) / self.spacing
+        upper = np.array(self.data.shape[:3]) - 1
+        inside = np.all((coordinates >= 0) & (coordinates <= upper), axis=1)
+
+        if self._cells is None or len(self._cells) != len(coordinates):
+            self._cells = np.zeros(coordinates.shape, dtype=np.intp)
+            moved = np.ones(len(coordinates), dtype=bool)
+        else:
+            offset = coordinates - self._cells
+            moved = np.any((offset < 0) | (offset >= 1), axis=1)
+        self._cells[moved] = np.clip(np.floor(coordinates[moved]), 0, upper - 1)
+        return coordinates, self._cells, inside
+
+    def __call__(self, position, time=None):
+        """
+        Interpolate the field at the positions, shape (N, 3) -> (N, 3).
+        The time argument is accepted for static maps and ignored.
+        """
+        coordinates, cells, inside = self.cell_indices(position)
+        fraction = coordinates - cells
+        if self.method == 'linear':
+            field = self._trilinear(cells, fraction)
+        else:
+            field = self._tricubic(cells, fraction)
+        field[~inside] = self.fill_value
+        return field
+
+    def _trilinear(self, cells, fraction):
+        # weighted sum over the 8 corners of every particle's cell
+        field = np.zeros((len(cells), 3))
+        for corner in np.ndindex(2, 2, 2):
+            weight = np.prod(np.where(corner, fraction, 1 - fraction), axis=1)
+            index = cells + corner
+            field += weight[:, None] * self.data[index[:, 0], index[:, 1], index[:, 2]]
+        return field
+
+    def _tricubic(self, cells, fraction):
+        # weighted sum over the 4 x 4 x 4 neighbourhood, clamped at the edges
+        upper = np.array(self.data.shape[:3]) - 1
+        weights = [_cubic_weights(fraction[:, axis]) for axis in range(3)]
+        field = np.zeros((len(cells), 3))
+        for offset in np.ndindex(4, 4, 4):
+            weight = weights[0][:, offset[0]] * weights[1][:, offset[1]] * weights[2][:, offset[2]]
+            index = np.clip(cells + np.array(offset) - 1, 0, upper)
+            field += weight[:, None] * self.data[index[:, 0], index[:, 1], index[:, 2]]
+        return field
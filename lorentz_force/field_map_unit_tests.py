@@ -0,0 +1,90 @@
+"""Unit tests for field_map.py"""
+
+import numpy as np
+import pytest
+from field_map import FieldMap
+from boris_tracker import track_particles
+
+ORIGIN = np.array([-1.0, -2.0, 0.0])
+SPACING = np.array([0.25, 0.5, 0.2])
+SHAPE = (9, 9, 11)
+
+
+def sample(function):
+    """Sample a vector function on the test grid."""
+    axes = [ORIGIN[i] + SPACING[i] * np.arange(SHAPE[i]) for i in range(3)]
+    grid = np.stack(np.meshgrid(*axes, indexing='ij'), axis=-1)
+    return function(grid.reshape(-1, 3)).reshape(SHAPE + (3,))
+
+
+def linear(points):
+    """A field that is linear in the position."""
+    return points @ np.array([[1.0, 2.0, 0.5], [0.0, -1.0, 3.0], [2.0, 0.0, 1.0]]) + 0.3
+
+
+def quadratic(points):
+    """A field that is quadratic in the position."""
+    return np.stack([points[:, 0] ** 2, points[:, 1] * points[:, 2], points[:, 2] ** 2], axis=1)
+
+
+def random_points(count, margin=0.0, seed=0):
+    """Random points inside the grid, at least margin cells from the boundary."""
+    upper = ORIGIN + SPACING * (np.array(SHAPE) - 1)
+    rng = np.random.default_rng(seed)
+    return rng.uniform(ORIGIN + margin * SPACING, upper - margin * SPACING, (count, 3))
+
+
+def test_linear_fields_are_reproduced():
+    """Test that both methods reproduce a linear field exactly."""
+    points = random_points(200, margin=1.0)
+    for method in ('linear', 'cubic'):
+        field_map = FieldMap(sample(linear), ORIGIN, SPACING, method)
+        np.testing.assert_allclose(field_map(points), linear(points), rtol=1e-12, atol=1e-12)
+
+
+def test_cubic_is_more_accurate_for_curved_fields():
+    """Test that tricubic interpolation beats trilinear on a quadratic field."""
+    points = random_points(500, margin=1.0)
+    errors = [np.max(np.abs(FieldMap(sample(quadratic), ORIGIN, SPACING, method)(points)
+                            - quadratic(points))) for method in ('linear', 'cubic')]
+    assert errors[1] < 1e-12 < errors[0]
+
+
+def test_points_outside_the_grid_get_the_fill_value():
+    """Test the fill value outside the grid."""
+    field_map = FieldMap(sample(linear), ORIGIN, SPACING, fill_value=0.0)
+    field = field_map(np.array([[-5.0, 0.0, 0.0], [0.0, 0.0, 1.0]]))
+    np.testing.assert_array_equal(field[0], 0.0)
+    np.testing.assert_allclose(field[1], linear(np.array([[0.0, 0.0, 1.0]]))[0])
+
+
+def test_cell_cache_follows_moving_particles(tmp_path):
+    """Test that a memory-mapped map with cached cells matches a fresh map."""
+    np.save(tmp_path / 'field.npy', sample(quadratic))
+    cached = FieldMap.load(tmp_path / 'field.npy', ORIGIN, SPACING)
+    points = random_points(300)
+    cached(points)
+
+    moved = np.clip(points + np.random.default_rng(1).normal(0, 0.1, points.shape),
+                    ORIGIN, ORIGIN + SPACING * (np.array(SHAPE) - 1))
+    fresh = FieldMap(sample(quadratic), ORIGIN, SPACING)
+    np.testing.assert_allclose(cached(moved), fresh(moved), rtol=1e-12)
+
+
+def test_uniform_map_in_tracker():
+    """Test that a uniform magnetic field map drives the Boris tracker."""
+    field_map = FieldMap(sample(lambda p: np.tile([0.0, 0.0, 1.0], (len(p), 1))), ORIGIN, SPACING)
+    particles = {'position': np.array([[0.0, 0.0, 1.0]]), 'velocity': np.array([[1e3, 0.0, 0.0]]),
+                 'charge': 1.6e-19, 'mass': 1.67e-27}
+
+    mapped = track_particles(particles, 1e-9, 100, {'magnetic': field_map})
+    uniform = track_particles(particles, 1e-9, 100, {'magnetic': [0.0, 0.0, 1.0]},
+                              options={'analytic': False})
+    np.testing.assert_allclose(mapped['particles']['position'],
+                               uniform['particles']['position'], rtol=1e-12)
+
+
+def test_rejects_bad_grids():
+    """Test that malformed grids raise ValueError."""
+    with pytest.raises(ValueError):
+        FieldMap(np.zeros((1, 4, 4, 3)), ORIGIN, SPACING)
@@ -0,0 +1,72 @@
+"""Unit tests for helical_orbit.py"""
+
+import numpy as np
+import pytest
+from helical_orbit import helical_orbit, uniform_fields
+from boris_tracker import track_particles
+
+CHARGE = 1.6e-19  # Coulombs
+MASS = 1.67e-27   # kg (proton)
+
+
+def random_particles(count, seed=0):
+    """Protons and antiprotons with random initial states."""
+    rng = np.random.default_rng(seed)
+    return {
+        'position': rng.normal(size=(count, 3)),
+        'velocity': rng.normal(0.0, 1e5, (count, 3)),
+        'charge': rng.choice([-CHARGE, CHARGE, 0.0], count),
+        'mass': MASS
+    }
+
+
+def test_matches_boris_integration():
+    """Test the closed form against a finely resolved Boris integration."""
+    particles = random_particles(20)
+    fields = {'electric': np.array([3e3, -1e3, 2e3]), 'magnetic': np.array([0.1, 0.4, 1.0])}
+
+    exact = helical_orbit(particles, [2e-7], fields)
+    boris = track_particles(particles, 2e-7 / 20000, 20000, fields, {'analytic': False})
+
+    np.testing.assert_allclose(exact['position'][0], boris['particles']['position'],
+                               rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(exact['velocity'][0], boris['particles']['velocity'],
+                               rtol=1e-5, atol=1.0)
+
+
+def test_uniform_acceleration_without_magnetic_field():
+    """Test that a pure electric field gives x0 + v0 t + a t^2 / 2."""
+    particles = random_particles(5, seed=1)
+    electric_field = np.array([0.0, 0.0, 1e3])
+    times = np.array([0.0, 1e-6, 3e-6])
+    orbit = helical_orbit(particles, times, {'electric': electric_field})
+
+    acceleration = particles['charge'][:, None] / MASS * electric_field
+    expected = (particles['position'] + particles['velocity'] * times[:, None, None]
+                + 0.5 * acceleration * times[:, None, None] ** 2)
+    np.testing.assert_allclose(orbit['position'], expected, rtol=1e-12)
+
+
+def test_tracker_switches_to_analytic_orbit(tmp_path):
+    """Test that the tracker uses the closed form for uniform fields only."""
+    particles = random_particles(10, seed=2)
+    fields = {'magnetic': np.array([0.0, 0.0, 1.0])}
+    result = track_particles(particles, 1e-9, 30, fields,
+                             {'stride': 10, 'output': tmp_path})
+
+    assert result['method'] == 'analytic'
+    assert result['energy_drift'] < 1e-12
+    expected = helical_orbit(particles, [0.0, 1e-8, 2e-8, 3e-8], fields)['position']
+    np.testing.assert_allclose(np.load(tmp_path / 'positions.npy'), expected, rtol=1e-12)
+
+    mapped = {'magnetic': lambda x, t: np.tile([0.0, 0.0, 1.0], (len(x), 1))}
+    assert track_particles(particles, 1e-9, 30, mapped)['method'] == 'boris'
+
+
+def test_uniform_fields_check():
+    """Test which field configurations qualify for the closed form."""
+    assert uniform_fields(None)
+    assert uniform_fields({'electric': [1.0, 0.0, 0.0], 'magnetic': None})
+    assert not uniform_fields({'magnetic': np.zeros((4, 3))})
+    with pytest.raises(ValueError):
+        helical_orbit(random_particles(4), [0.0], {'magnetic': np.zeros((4, 3))})
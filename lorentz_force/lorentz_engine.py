@@ -0,0 +1,90 @@
+"""
+This module calculates the full Lorentz force vector
+
+    F = q (E + v x B)
+
+for whole ensembles of particles stored as structure-of-arrays:
+charges q with shape (N,), velocities v with shape (N, 3), and electric
+and magnetic fields given either as one uniform vector of shape (3,) or
+per particle with shape (N, 3).
+
+The cross product is assembled column by column into the output array,
+so a call allocates at most one scratch column regardless of N and never
+loops over particles in Python.
+"""
+
+import numpy as np
+
+# index triples (i, j, k) with (v x B)_i = v_j B_k - v_k B_j
+_CROSS_INDICES = ((0, 1, 2), (1, 2, 0), (2, 0, 1))
+
+
+def field_columns(field, num_particles):
+    """
+    Split a field into its x, y and z components.
+
+    Args:
+        field: None (no field), a uniform vector of shape (3,),
+            or per-particle vectors of shape (N, 3)
+        num_particles: number of particles N
+
+    Returns:
+        Tuple of three components, each a float or an array of shape (N,)
+    """
+    if field is None:
+        return (0.0, 0.0, 0.0)
+    field = np.asarray(field, dtype=float)
+    if field.shape == (3,):
+        return tuple(float(component) for component in field)
+    if field.shape != (num_particles, 3):
+        raise ValueError("Fields must have shape (3,) or (N, 3).")
+    return (field[:, 0], field[:, 1], field[:, 2])
+
+
+def lorentz_force_vectors(charge, velocity, electric_field=None,
+                          magnetic_field=None, out=None):
+    """
+    Calculation of Lorentz force vectors for N particles.
+
+    Args:
+        charge: charges (C), scalar or shape (N,)
+        velocity: velocities (m/s), shape (N, 3)
+        electric_field: E (V/m), None, shape (3,) or shape (N, 3)
+        magnetic_field: B (T), None, shape (3,) or shape (N, 3)
+        out: optional float array of shape (N, 3) receiving the result; it
+            may be the velocity or a field array, since overlapping buffers
+            are computed in a temporary first
+
+    Returns:
+        Lorentz forces (N), shape (N, 3)
+    """
+    velocity = np.asarray(velocity, dtype=float)
+    if velocity.ndim != 2 or velocity.shape[1] != 3:
+        raise ValueError("Velocities must have shape (N, 3).")
+    num_particles = velocity.shape[0]
+    target = out
+    if out is None:
+        out = np.empty((num_particles, 3))
+    elif out.shape != (num_particles, 3):
+        raise ValueError("out must have shape (N, 3).")
+    elif any(field is not None and np.shares_memory(out, field)
+             for field in (velocity, electric_field, magnetic_field)):
+        # the columns below would read components that were already overwritten
+        out = np.empty((num_particles, 3))
+
+    e_columns = field_columns(electric_field, num_particles)
+    b_columns = field_columns(magnetic_field, num_particles)
+    scratch = np.empty(num_particles)
+
+    for i, j, k in _CROSS_INDICES:
+        np.multiply(velocity[:, j], b_columns[k], out=out[:, i])
+        np.multiply(velocity[:, k], b_columns[j], out=scratch)
+        out[:, i] -= scratch
+        out[:, i] += e_columns[i]
+
+    charge = np.asarray(charge, dtype=float)
+    out *= charge[:, None] if charge.ndim else charge
+    if target is not None and target is not out:
+        target[...] = out
+        return target
+    return out
@@ -0,0 +1,57 @@
+"""Unit tests for lorentz_engine.py"""
+
+import math
+import numpy as np
+import pytest
+from lorentz_engine import lorentz_force_vectors
+from lorentz_force import lorentz_force
+
+
+def test_matches_cross_product_with_per_particle_fields():
+    """Test the engine against q (E + v x B) from np.cross."""
+    rng = np.random.default_rng(1)
+    charge = rng.normal(size=50) * 1.6e-19
+    velocity = rng.normal(size=(50, 3)) * 1e6
+    electric_field = rng.normal(size=(50, 3)) * 1e3
+    magnetic_field = rng.normal(size=(50, 3))
+
+    expected = charge[:, None] * (electric_field + np.cross(velocity, magnetic_field))
+    forces = lorentz_force_vectors(charge, velocity, electric_field, magnetic_field)
+    np.testing.assert_allclose(forces, expected, rtol=1e-12, atol=1e-30)
+
+
+def test_uniform_fields_and_out_argument():
+    """Test uniform fields, a scalar charge and writing into out."""
+    velocity = np.array([[2e6, 0.0, 0.0], [0.0, 3e6, 0.0]])
+    out = np.full((2, 3), np.nan)
+    result = lorentz_force_vectors(1.6e-19, velocity, [0.0, 0.0, 1e3], [0.0, 0.0, 1.2], out=out)
+
+    assert result is out
+    np.testing.assert_allclose(out[0], [0.0, -1.6e-19 * 2e6 * 1.2, 1.6e-16])
+    np.testing.assert_allclose(out[1], [1.6e-19 * 3e6 * 1.2, 0.0, 1.6e-16])
+
+
+def test_out_may_be_the_velocity():
+    """Test writing the forces into the velocity array itself."""
+    rng = np.random.default_rng(2)
+    velocity = rng.normal(0.0, 1e6, (50, 3))
+    magnetic = rng.normal(size=(50, 3))
+    expected = 2.0 * np.cross(velocity, magnetic)
+
+    result = lorentz_force_vectors(2.0, velocity, magnetic_field=magnetic, out=velocity)
+    assert result is velocity
+    np.testing.assert_allclose(velocity, expected, rtol=1e-12)
+
+
+def test_magnitude_matches_scalar_lorentz_force():
+    """Test that |F| equals q v B sin(angle) from lorentz_force."""
+    angle = math.pi / 6
+    velocity = np.array([[2e6 * math.cos(angle), 2e6 * math.sin(angle), 0.0]])
+    force = lorentz_force_vectors(1.6e-19, velocity, magnetic_field=[0.8, 0.0, 0.0])
+    assert math.isclose(np.linalg.norm(force[0]), lorentz_force(1.6e-19, 2e6, 0.8, angle))
+
+
+def test_rejects_bad_shapes():
+    """Test that mismatched field shapes raise ValueError."""
+    with pytest.raises(ValueError):
+        lorentz_force_vectors(1.0, np.zeros((4, 3)), magnetic_field=np.zeros((3, 3)))
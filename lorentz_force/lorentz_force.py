@@ -1,12 +1,15 @@
 """
 This module calculates the Lorentz force on moving charged particles
-in a magnetic field using functional programming concepts.
+in a magnetic field.
 
-It demonstrates the use of lambda functions and the map function to calculate
-the Lorentz force for a list of particles.
+lorentz_force works on single values as well as on whole NumPy arrays,
+so the forces of a particle ensemble stored as records
+(see particle_records.py) are computed in one call.
 """
 
 import math
+import numpy as np
+from particle_records import from_dicts
 
 def lorentz_force(charge, velocity, magnetic_field, angle_radians):
     """
@@ -14,20 +17,21 @@ def lorentz_force(charge, velocity, magnetic_field, angle_radians):
 
     Args:
         charge, velocity, magnetic_field, angle_radians
+        (scalars or arrays of equal shape)
 
     Returns:
         Lorentz force
     """
-    return charge * velocity * magnetic_field * math.sin(angle_radians)
+    return charge * velocity * magnetic_field * np.sin(angle_radians)
 
 def main():
     """
     Demonstrates the calculation of Lorentz forces for a list of particles.
 
-    This function uses the `lorentz_force` lambda function and `map` to compute
-    the Lorentz force for a set of particles, each represented by a dictionary
-    containing its charge, velocity, magnetic field, and the angle between
-    its velocity and the magnetic field.
+    The particles are converted into records of SCALAR_PARTICLE_DTYPE,
+    one column each for charge, velocity, magnetic field, and the angle
+    between velocity and magnetic field, and `lorentz_force` is applied to
+    the columns at once.
 
     Args:
         None
@@ -58,15 +62,11 @@ def main():
         }
     ]
 
-    # Use map to apply lorentz_force to each particle
-    forces = list(
-        map(
-            lambda p: lorentz_force(
-                p['charge'], p['velocity'],
-                p['magnetic_field'], p['angle_radians']
-            ),
-            particles
-        )
+    # Store the particles as compact records and compute all forces at once
+    records = from_dicts(particles)
+    forces = lorentz_force(
+        records['charge'], records['velocity'],
+        records['magnetic_field'], records['angle_radians']
     )
 
     # Print the Lorentz forces for each particle
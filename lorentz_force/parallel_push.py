@@ -0,0 +1,178 @@
+"""
+This module runs the Boris push of boris_tracker on several processes.
+
+The particle arrays live in multiprocessing.shared_memory blocks. Every
+worker attaches to the blocks once, owns a contiguous shard of particles
+and advances it in place, so no particle data is pickled after start-up.
+After each step the workers meet at a barrier, which keeps all shards at
+the same time step; a worker that dies breaks the barrier after
+BARRIER_TIMEOUT seconds instead of leaving the others waiting. Per-particle
+fields and time steps are sliced to the worker's shard.
+
+measure_scaling times the same run on different numbers of workers and
+reports throughput, speed-up and parallel efficiency; running this module
+prints that report for the worker counts available on the machine.
+"""
+
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from boris_tracker import boris_push, copy_particles
+
+_SHARED_KEYS = ('position', 'velocity', 'charge', 'mass')
+BARRIER_TIMEOUT = 300.0  # seconds a worker waits for the others at each step
+
+
+def _shard_bounds(num_particles, workers):
+    # contiguous, nearly equal shards [bounds[w], bounds[w + 1])
+    return np.linspace(0, num_particles, workers + 1).astype(int)
+
+
+def _attach(layout):
+    # maps every shared block described by layout to a NumPy array
+    blocks = {key: shared_memory.SharedMemory(name=name) for key, (name, _) in layout.items()}
+    arrays = {key: np.ndarray(shape, dtype=float, buffer=blocks[key].buf)
+              for key, (_, shape) in layout.items()}
+    return blocks, arrays
+
+
+def _shard_run(run, shard):
+    # per-particle (N, 3) fields and (N,) time steps restricted to one shard
+    fields = {name: field[shard[0]:shard[1]]
+              if not callable(field) and np.ndim(field) == 2 else field
+              for name, field in (run['fields'] or {}).items()}
+    dt = run['dt'][shard[0]:shard[1]] if np.ndim(run['dt']) == 1 else run['dt']
+    return dt, fields
+
+
+def _worker(layout, shard, barrier, run):
+    # advances one shard of particles in lockstep with the other workers
+    blocks, arrays = _attach(layout)
+    try:
+        particles = {key: array[shard[0]:shard[1]] for key, array in arrays.items()}
+        dt, fields = _shard_run(run, shard)
+        for step in range(run['num_steps']):
+            boris_push(particles, dt, fields, time=step * dt)
+            barrier.wait(timeout=BARRIER_TIMEOUT)
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        del arrays
+        for block in blocks.values():
+            block.close()
+
+
+def _run_workers(layout, bounds, run):
+    # starts one process per shard and waits for all of them
+    context = mp.get_context()
+    barrier = context.Barrier(len(bounds) - 1)
+    processes = [context.Process(target=_worker, args=(layout, bounds[w:w + 2], barrier, run))
+                 for w in range(len(bounds) - 1)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    if any(process.exitcode != 0 for process in processes):
+        raise RuntimeError("A particle push worker failed.")
+
+
+def parallel_track(particles, dt, num_steps, fields=None, workers=None):
+    """
+    Push N particles through num_steps Boris steps on several processes.
+
+    Args:
+        particles: initial state as described in boris_tracker.boris_push
+        dt: time step (s), scalar or per particle (N,)
+        num_steps: number of steps
+        fields: see boris_tracker.field_at; sent once to every worker, so
+            callables must be picklable (e.g. a FieldMap); per-particle
+            (N, 3) arrays are sliced to each worker's shard
+        workers: number of processes, default os.cpu_count()
+
+    Returns:
+        Dictionary with the final 'particles', the final 'time' and the
+        number of 'workers' used
+    """
+    state = copy_particles(particles)
+    num_particles = len(state['position'])
+    state['charge'] = np.broadcast_to(state['charge'], (num_particles,))
+    state['mass'] = np.broadcast_to(state['mass'], (num_particles,))
+    workers = max(1, min(workers or os.cpu_count(), num_particles))
+
+    blocks = {key: shared_memory.SharedMemory(create=True, size=max(1, state[key].nbytes))
+              for key in _SHARED_KEYS}
+    try:
+        layout = {key: (blocks[key].name, state[key].shape) for key in _SHARED_KEYS}
+        for key in _SHARED_KEYS:
+            np.ndarray(state[key].shape, dtype=float, buffer=blocks[key].buf)[...] = state[key]
+
+        _run_workers(layout, _shard_bounds(num_particles, workers),
+                     {'dt': np.asarray(dt, dtype=float), 'num_steps': num_steps, 'fields': fields})
+
+        for key in _SHARED_KEYS:
+            state[key] = np.ndarray(state[key].shape, dtype=float,
+                                    buffer=blocks[key].buf).copy()
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    return {'particles': state, 'time': num_steps * dt, 'workers': workers}
+
+
+def measure_scaling(num_particles, num_steps, worker_counts, fields=None):
+    """
+    Time parallel_track for several worker counts.
+
+    Args:
+        num_particles: number of protons in the test ensemble
+        num_steps: number of Boris steps per run
+        worker_counts: iterable of process counts to measure
+        fields: fields for the run, default a uniform 1 T magnetic field
+
+    Returns:
+        Dictionary mapping each worker count to a dictionary with 'seconds',
+        'particle_steps_per_second', 'speedup' (relative to the first
+        count) and 'efficiency' (speed-up per added worker)
+    """
+    rng = np.random.default_rng(0)
+    particles = {
+        'position': np.zeros((num_particles, 3)),
+        'velocity': rng.normal(0.0, 1e5, (num_particles, 3)),
+        'charge': 1.6e-19,
+        'mass': 1.67e-27
+    }
+    fields = fields or {'magnetic': np.array([0.0, 0.0, 1.0])}
+
+    report = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        parallel_track(particles, 1e-10, num_steps, fields, workers)
+        report[workers] = {'seconds': time.perf_counter() - start}
+
+    base_workers = next(iter(report))
+    for workers, entry in report.items():
+        entry['particle_steps_per_second'] = num_particles * num_steps / entry['seconds']
+        entry['speedup'] = report[base_workers]['seconds'] / entry['seconds']
+        entry['efficiency'] = entry['speedup'] * base_workers / workers
+    return report
+
+
+def main():
+    """
+    Prints the scaling of a 10^6 particle, 100 step push for
+    1, 2, 4, ... 64 workers, limited to the cores of this machine.
+    """
+    counts = [w for w in (1, 2, 4, 8, 16, 32, 64) if w <= (os.cpu_count() or 1)]
+    report = measure_scaling(10**6, 100, counts)
+    print("workers  seconds  particle-steps/s  speedup  efficiency")
+    for workers, entry in report.items():
+        print(f"{workers:7d}  {entry['seconds']:7.2f}  {entry['particle_steps_per_second']:16.3e}"
+              f"  {entry['speedup']:7.2f}  {entry['efficiency']:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
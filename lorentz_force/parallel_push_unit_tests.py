@@ -0,0 +1,53 @@
+"""Unit tests for parallel_push.py"""
+
+import numpy as np
+from boris_tracker import track_particles
+from parallel_push import parallel_track, measure_scaling
+
+
+def test_parallel_push_matches_serial_push():
+    """Test that sharded workers reproduce the single-process tracker."""
+    rng = np.random.default_rng(3)
+    particles = {
+        'position': rng.normal(size=(101, 3)),
+        'velocity': rng.normal(0.0, 1e5, (101, 3)),
+        'charge': rng.choice([-1.6e-19, 1.6e-19], 101),
+        'mass': 1.67e-27
+    }
+    fields = {'electric': np.array([0.0, 1e3, 0.0]), 'magnetic': np.array([0.2, 0.0, 1.0])}
+
+    serial = track_particles(particles, 1e-10, 50, fields, {'analytic': False})
+    parallel = parallel_track(particles, 1e-10, 50, fields, workers=3)
+
+    assert parallel['workers'] == 3
+    for key in ('position', 'velocity'):
+        np.testing.assert_allclose(parallel['particles'][key], serial['particles'][key],
+                                   rtol=1e-13)
+
+
+def test_per_particle_fields_and_steps_are_sharded():
+    """Test per-particle (N, 3) fields and (N,) time steps split over workers."""
+    rng = np.random.default_rng(4)
+    particles = {
+        'position': rng.normal(size=(10, 3)),
+        'velocity': rng.normal(0.0, 1e5, (10, 3)),
+        'charge': 1.6e-19,
+        'mass': 1.67e-27
+    }
+    fields = {'magnetic': rng.normal(size=(10, 3)), 'electric': rng.normal(0.0, 1e3, (10, 3))}
+    dt = rng.uniform(1e-11, 1e-10, 10)
+
+    serial = track_particles(particles, dt, 5, fields, {'analytic': False})
+    parallel = parallel_track(particles, dt, 5, fields, workers=2)
+
+    for key in ('position', 'velocity'):
+        np.testing.assert_allclose(parallel['particles'][key], serial['particles'][key],
+                                   rtol=1e-13)
+
+
+def test_scaling_report():
+    """Test the fields of the scaling report."""
+    report = measure_scaling(1000, 5, [1, 2])
+    assert list(report) == [1, 2]
+    assert report[1]['speedup'] == 1.0
+    assert all(entry['particle_steps_per_second'] > 0 for entry in report.values())
@@ -0,0 +1,132 @@
+"""
+This module stores particle ensembles as NumPy structured arrays.
+
+One particle of PARTICLE_DTYPE takes 64 bytes (charge, mass, position and
+velocity as float64), and every field of the array is a column view, so
+
+    particles['velocity']      # (N, 3) view, no copy
+
+can be passed straight to lorentz_engine, boris_tracker and helical_orbit,
+which index particles by the same keys as their dictionaries.
+SCALAR_PARTICLE_DTYPE holds the inputs of lorentz_force.lorentz_force.
+
+Ensembles are saved either as CSV with one column per component
+(position_x, position_y, ...) or as .npy files, which load_particles_binary
+memory-maps so that even 10^8 particles open instantly and are paged in on
+access. CSV files are parsed in chunks into a preallocated array, so memory
+use is the size of the result plus one chunk.
+"""
+
+import numpy as np
+from numpy.lib import recfunctions
+
+PARTICLE_DTYPE = np.dtype([
+    ('charge', 'f8'),            # C
+    ('mass', 'f8'),              # kg
+    ('position', 'f8', (3,)),    # m
+    ('velocity', 'f8', (3,))     # m/s
+])
+
+SCALAR_PARTICLE_DTYPE = np.dtype([
+    ('charge', 'f8'),            # C
+    ('velocity', 'f8'),          # m/s
+    ('magnetic_field', 'f8'),    # T
+    ('angle_radians', 'f8')      # angle between velocity and field
+])
+
+CSV_CHUNK_ROWS = 1_000_000  # rows parsed per chunk when loading CSV files
+
+
+def empty_particles(count, dtype=PARTICLE_DTYPE):
+    """Zero-initialised particle records."""
+    return np.zeros(count, dtype=dtype)
+
+
+def from_dicts(particles, dtype=SCALAR_PARTICLE_DTYPE):
+    """Convert a list of particle dictionaries into records."""
+    return np.array([tuple(p[name] for name in dtype.names) for p in particles], dtype=dtype)
+
+
+def csv_columns(dtype=PARTICLE_DTYPE):
+    """Column names of the CSV format, vector fields split into _x, _y, _z."""
+    columns = []
+    for name in dtype.names:
+        shape = dtype[name].shape
+        if shape:
+            columns.extend(f"{name}_{axis}" for axis in 'xyz'[:shape[0]])
+        else:
+            columns.append(name)
+    return columns
+
+
+def save_particles_csv(path, records, chunk_rows=CSV_CHUNK_ROWS):
+    """Write records to a CSV file with a header row, chunk by chunk."""
+    with open(path, 'w', encoding='utf-8') as handle:
+        handle.write(','.join(csv_columns(records.dtype)) + '\n')
+        for start in range(0, len(records), chunk_rows):
+            chunk = recfunctions.structured_to_unstructured(records[start:start + chunk_rows])
+            np.savetxt(handle, chunk, delimiter=',', fmt='%.17g')
+
+
+_WHITESPACE = np.frombuffer(b' \t\r\n', dtype=np.uint8)
+
+
+def _count_rows(path):
+    # counts the non-blank data rows of a text file by scanning it in binary blocks;
+    # an empty file has no header and no rows
+    lines = 0
+    filled = False  # whether the current line has shown anything but whitespace
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(2**24), b''):
+            data = np.frombuffer(block, dtype=np.uint8)
+            ends = np.flatnonzero(data == ord('\n'))
+            # non-whitespace characters before every position
+            prefix = np.concatenate([[0], np.cumsum(~np.isin(data, _WHITESPACE))])
+            content = prefix[ends] - prefix[np.concatenate([[0], ends[:-1] + 1])]
+            if len(ends):
+                content[0] += filled
+                filled = prefix[-1] > prefix[ends[-1] + 1]
+            else:
+                filled = filled or prefix[-1] > 0
+            lines += np.count_nonzero(content)
+    lines += filled
+    return max(int(lines) - 1, 0)
+
+
+def load_particles_csv(path, dtype=PARTICLE_DTYPE, chunk_rows=CSV_CHUNK_ROWS):
+    """
+    Read records written by save_particles_csv.
+
+    The rows are counted first so that the result is allocated once;
+    chunks of chunk_rows rows are then parsed straight into it. An empty
+    file gives an empty record array.
+    """
+    num_rows = _count_rows(path)
+    records = np.empty(num_rows, dtype=dtype)
+    with open(path, 'r', encoding='utf-8') as handle:
+        header = handle.readline().strip().split(',')
+        if header == [''] and not num_rows:
+            return records
+        if header != csv_columns(dtype):
+            raise ValueError("CSV columns do not match the particle dtype.")
+        for start in range(0, num_rows, chunk_rows):
+            rows = min(chunk_rows, num_rows - start)
+            chunk = np.loadtxt(handle, delimiter=',', max_rows=rows, ndmin=2)
+            records[start:start + rows] = recfunctions.unstructured_to_structured(chunk, dtype)
+    return records
+
+
+def save_particles_binary(path, records):
+    """Write records to a .npy file."""
+    np.save(path, records)
+
+
+def load_particles_binary(path, dtype=PARTICLE_DTYPE, mmap=True):
+    """
+    Open records saved by save_particles_binary, memory-mapped read-only
+    by default.
+    """
+    records = np.load(path, mmap_mode='r' if mmap else None)
+    if records.dtype != dtype:
+        raise ValueError("Binary file does not contain the requested particle dtype.")
+    return records
@@ -0,0 +1,91 @@
+"""Unit tests for particle_records.py"""
+
+import math
+import numpy as np
+import pytest
+from particle_records import (PARTICLE_DTYPE, SCALAR_PARTICLE_DTYPE, empty_particles,
+                              from_dicts, csv_columns, save_particles_csv, load_particles_csv,
+                              save_particles_binary, load_particles_binary)
+from boris_tracker import boris_push
+from lorentz_force import lorentz_force
+
+
+def random_records(count):
+    """Particle records with random contents."""
+    rng = np.random.default_rng(0)
+    records = empty_particles(count)
+    records['charge'] = rng.choice([-1.6e-19, 1.6e-19], count)
+    records['mass'] = 1.67e-27
+    records['position'] = rng.normal(size=(count, 3))
+    records['velocity'] = rng.normal(0.0, 1e5, (count, 3))
+    return records
+
+
+def test_records_are_compact():
+    """Test the record size of 8 float64 values per particle."""
+    assert PARTICLE_DTYPE.itemsize == 64
+    assert csv_columns() == ['charge', 'mass', 'position_x', 'position_y', 'position_z',
+                             'velocity_x', 'velocity_y', 'velocity_z']
+
+
+def test_scalar_records_feed_lorentz_force():
+    """Test converted dictionaries against the per-particle calculation."""
+    particles = [
+        {'charge': 1.6e-19, 'velocity': 2.0e6, 'magnetic_field': 1.2, 'angle_radians': math.pi / 4},
+        {'charge': -1.6e-19, 'velocity': 3.0e6, 'magnetic_field': 0.8, 'angle_radians': 0.5}
+    ]
+    records = from_dicts(particles)
+    assert records.dtype == SCALAR_PARTICLE_DTYPE
+
+    forces = lorentz_force(records['charge'], records['velocity'],
+                           records['magnetic_field'], records['angle_radians'])
+    for force, p in zip(forces, particles):
+        assert math.isclose(force, lorentz_force(p['charge'], p['velocity'],
+                                                 p['magnetic_field'], p['angle_radians']))
+
+
+def test_csv_round_trip_in_chunks(tmp_path):
+    """Test that CSV files written and read in small chunks round-trip exactly."""
+    records = random_records(25)
+    save_particles_csv(tmp_path / 'particles.csv', records, chunk_rows=7)
+    loaded = load_particles_csv(tmp_path / 'particles.csv', chunk_rows=4)
+    np.testing.assert_array_equal(loaded, records)
+
+
+def test_csv_with_trailing_blank_lines(tmp_path):
+    """Test that blank lines at the end of a CSV file are not counted as rows."""
+    records = random_records(5)
+    save_particles_csv(tmp_path / 'particles.csv', records)
+    with open(tmp_path / 'particles.csv', 'a', encoding='utf-8') as handle:
+        handle.write('\n \n')
+    np.testing.assert_array_equal(load_particles_csv(tmp_path / 'particles.csv', chunk_rows=2),
+                                  records)
+
+
+def test_empty_trajectory_round_trip(tmp_path):
+    """Test that empty record arrays and empty files load as empty arrays."""
+    records = empty_particles(0)
+    save_particles_csv(tmp_path / 'particles.csv', records)
+    save_particles_binary(tmp_path / 'particles.npy', records)
+    (tmp_path / 'blank.csv').write_text('')
+
+    for loaded in (load_particles_csv(tmp_path / 'particles.csv'),
+                   load_particles_binary(tmp_path / 'particles.npy'),
+                   load_particles_csv(tmp_path / 'blank.csv')):
+        assert loaded.shape == (0,)
+        assert loaded.dtype == PARTICLE_DTYPE
+
+
+def test_binary_files_are_memory_mapped(tmp_path):
+    """Test the memory-mapped binary format and its use in the tracker."""
+    records = random_records(10)
+    save_particles_binary(tmp_path / 'particles.npy', records)
+    loaded = load_particles_binary(tmp_path / 'particles.npy')
+
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, records)
+    boris_push(records, 1e-10, {'magnetic': [0.0, 0.0, 1.0]})
+    assert not np.array_equal(records['position'], loaded['position'])
+
+    with pytest.raises(ValueError):
+        load_particles_binary(tmp_path / 'particles.npy', dtype=SCALAR_PARTICLE_DTYPE)
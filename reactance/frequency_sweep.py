@@ -0,0 +1,123 @@
+"""
+frequency_sweep.py
+
+This module evaluates the circuits of reactance.py over whole frequency
+grids, as for Bode plots, and finds their resonances.
+
+A circuit is described by the keys of total_impedance_and_phase except
+'f': 'indc', 'capa', 'resistance', 'length' and 'radius' (plus the
+optional 'wire_model' and its parameters), each a scalar or an array with
+one entry per circuit. The wire parasitics depend only on the geometry,
+so they are looked up once per circuit in reactance.PARASITIC_CACHE and
+reused for every frequency. The total reactance of a circuit is then
+
+    X(f) = 2 pi f L_total - 1 / (2 pi f C_series)
+
+with L_total = indc + wire inductance and 1/C_series = 1/capa + 1/wire
+capacitance.
+
+Resonances (X = 0) are bracketed by sign changes of X between neighbouring
+grid frequencies of all circuits at once and refined by a safeguarded
+Newton iteration with the analytic derivative dX/df.
+
+Functions:
+- circuit_arrays(circuits): Per-circuit L_total and 1/C_series.
+- sweep_impedance(frequencies, circuits): Complex Z, |Z| and phase on the
+  grid, shape (circuits, frequencies).
+- find_resonances(frequencies, circuits): Circuit index and frequency of
+  every resonance inside the grid.
+"""
+
+import numpy as np
+from reactance import PARASITIC_CACHE
+
+RESONANCE_RTOL = 1e-12   # relative tolerance of refined resonance frequencies
+MAX_ITERATIONS = 100     # Newton/bisection iterations
+
+
+def circuit_arrays(circuits):
+    """
+    Compute the total inductance and the inverse series capacitance of
+    every circuit, including the wire parasitics, as arrays of shape (C,).
+    """
+    wire_l, wire_c = PARASITIC_CACHE.evaluate(circuits.get('wire_model', 'straight'), circuits)
+    total_l = np.asarray(circuits['indc'], dtype=float) + wire_l
+    inverse_c = 1 / np.asarray(circuits['capa'], dtype=float) + 1 / wire_c
+    resistance = np.asarray(circuits['resistance'], dtype=float)
+    num_circuits = np.broadcast(total_l, inverse_c, resistance).shape
+    return (np.broadcast_to(total_l, num_circuits).ravel(),
+            np.broadcast_to(inverse_c, num_circuits).ravel(),
+            np.broadcast_to(resistance, num_circuits).ravel())
+
+
+def _reactance(freq, total_l, inverse_c):
+    """
+    Total reactance and its derivative with respect to frequency.
+    """
+    omega = 2 * np.pi * freq
+    with np.errstate(divide='ignore'):
+        reactance = omega * total_l - inverse_c / omega
+        derivative = 2 * np.pi * (total_l + inverse_c / omega**2)
+    return reactance, derivative
+
+
+def sweep_impedance(frequencies, circuits):
+    """
+    Evaluate the impedance of every circuit at every frequency.
+
+    Returns a dictionary of 'impedance' (complex), 'magnitude' (Ohms) and
+    'phase' (degrees), each of shape (C, F). Zero frequency gives an
+    infinite negative reactance and a phase of -90 degrees.
+    """
+    total_l, inverse_c, resistance = circuit_arrays(circuits)
+    freq = np.asarray(frequencies, dtype=float)
+    reactance = _reactance(freq[None, :], total_l[:, None], inverse_c[:, None])[0]
+
+    # real and imaginary parts are set separately to keep infinities finite-real
+    impedance = np.empty(reactance.shape, dtype=complex)
+    impedance.real = resistance[:, None]
+    impedance.imag = reactance
+    return {
+        'impedance': impedance,
+        'magnitude': np.abs(impedance),
+        'phase': np.angle(impedance, deg=True)
+    }
+
+
+def _refine(lower, upper, total_l, inverse_c):
+    """
+    Safeguarded Newton iteration for X = 0 inside every bracket.
+    """
+    rising = _reactance(upper, total_l, inverse_c)[0] > _reactance(lower, total_l, inverse_c)[0]
+    root = 0.5 * (lower + upper)
+    for _ in range(MAX_ITERATIONS):
+        value, derivative = _reactance(root, total_l, inverse_c)
+        # converged when X is negligible against its two terms
+        scale = 2 * np.pi * root * total_l + inverse_c / (2 * np.pi * root)
+        if np.all((np.abs(value) <= RESONANCE_RTOL * scale)
+                  | (upper - lower <= RESONANCE_RTOL * root)):
+            break
+        above = (value > 0) == rising
+        upper = np.where(above, root, upper)
+        lower = np.where(above, lower, root)
+        newton = root - value / derivative
+        inside = np.isfinite(newton) & (newton > lower) & (newton < upper)
+        root = np.where(inside, newton, 0.5 * (lower + upper))
+    return root
+
+
+def find_resonances(frequencies, circuits):
+    """
+    Find every frequency where the reactance of a circuit changes sign
+    between two neighbouring grid frequencies.
+
+    The frequencies must be sorted. Returns (circuit index, resonance
+    frequency), two arrays with one entry per resonance found.
+    """
+    total_l, inverse_c, _ = circuit_arrays(circuits)
+    freq = np.asarray(frequencies, dtype=float)
+    sign = np.sign(_reactance(freq[None, :], total_l[:, None], inverse_c[:, None])[0])
+
+    # brackets: neighbouring grid points with reactances of opposite sign
+    circuit, left = np.nonzero((sign[:, :-1] * sign[:, 1:] < 0) | (sign[:, 1:] == 0))
+    return circuit, _refine(freq[left], freq[left + 1], total_l[circuit], inverse_c[circuit])
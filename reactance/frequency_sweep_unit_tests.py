@@ -0,0 +1,65 @@
+"""
+frequency_sweep_unit_tests.py
+
+This module contains unit tests for the `frequency_sweep.py` module: the
+impedance grid is checked against `total_impedance_and_phase` and the
+resonances against the closed form 1 / (2 pi sqrt(L C)).
+"""
+
+import unittest
+import numpy as np
+from frequency_sweep import circuit_arrays, sweep_impedance, find_resonances
+from reactance import total_impedance_and_phase
+
+
+class TestFrequencySweep(unittest.TestCase):
+    """
+    TestFrequencySweep
+
+    Unit tests for frequency sweeps and resonance detection over many
+    circuits.
+    """
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        num_circuits = 3000
+        self.circuits = {
+            'indc': rng.uniform(1e-6, 1e-2, num_circuits),
+            'capa': rng.uniform(1e-12, 1e-6, num_circuits),
+            'resistance': rng.uniform(1, 100, num_circuits),
+            'length': rng.uniform(0.1, 10, num_circuits),
+            'radius': rng.uniform(1e-4, 1e-2, num_circuits)
+        }
+        self.frequencies = np.geomspace(1, 1e9, 200)
+
+    def test_sweep_matches_single_frequency(self):
+        """Test the grid against total_impedance_and_phase"""
+        sweep = sweep_impedance(self.frequencies, self.circuits)
+        self.assertEqual(sweep['impedance'].shape, (3000, 200))
+        for circuit, column in ((0, 0), (17, 99), (2999, 199)):
+            tip_dict = {key: value[circuit] for key, value in self.circuits.items()}
+            tip_dict['f'] = self.frequencies[column]
+            total_z, phase = total_impedance_and_phase(tip_dict)
+            self.assertAlmostEqual(sweep['magnitude'][circuit, column] / total_z, 1.0,
+                                   places=12)
+            self.assertAlmostEqual(sweep['phase'][circuit, column], phase, places=9)
+
+    def test_resonances_match_closed_form(self):
+        """Test refined resonances against 1 / (2 pi sqrt(L C))"""
+        total_l, inverse_c, _ = circuit_arrays(self.circuits)
+        expected = np.sqrt(inverse_c / total_l) / (2 * np.pi)
+        circuit, resonance = find_resonances(self.frequencies, self.circuits)
+
+        inside = (expected > self.frequencies[0]) & (expected < self.frequencies[-1])
+        np.testing.assert_array_equal(circuit, np.flatnonzero(inside))
+        np.testing.assert_allclose(resonance, expected[circuit], rtol=1e-10)
+
+    def test_zero_frequency(self):
+        """Test that zero frequency gives a phase of -90 degrees, not NaN"""
+        sweep = sweep_impedance([0.0, 60.0], {key: value[:2] for key, value
+                                              in self.circuits.items()})
+        np.testing.assert_array_equal(sweep['phase'][:, 0], [-90.0, -90.0])
+        self.assertTrue(np.all(np.isfinite(sweep['magnitude'][:, 1])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+"""
+monte_carlo.py
+
+This module runs Monte Carlo tolerance analyses of the circuits of
+reactance.py: every component value is drawn around its nominal value and
+the spread of the impedance magnitude and phase is reported.
+
+The samples are split into batches. Every batch draws its components in
+bulk from its own numpy.random.Generator, seeded by a child of one
+SeedSequence, so the results depend only on the seed and the batch size,
+not on the number of worker processes or the order in which batches
+finish. Batches are evaluated with complex_impedance and reduced to
+histograms over fixed bin edges plus their mean and sum of squared
+deviations, which are merged across batches with Chan's pairwise update
+(raw sums of squares would cancel); no sample is kept. Percentiles are
+read from the summed histograms by linear interpolation within a bin, so
+their resolution is one bin width; samples outside the bins count towards
+the ranks but clamp to the outer edges. The bin edges come from a pilot
+batch drawn from its own child seed.
+
+Functions:
+- draw_samples(seed, nominal, tolerances, size, distribution): Component
+  arrays for one batch.
+- monte_carlo_impedance(nominal, tolerances, num_samples, options): The
+  full analysis, optionally on a process pool.
+- histogram_percentiles(edges, counts, percentiles, outside): Percentiles
+  of a histogram.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from reactance import complex_impedance
+
+DEFAULT_OPTIONS = {
+    'seed': 0,
+    'batch_size': 100000,
+    'workers': 1,
+    'bins': 4096,
+    'percentiles': (1, 5, 50, 95, 99),
+    'distribution': 'uniform'
+}
+PILOT_SIZE = 10000   # samples of the pilot batch that sets the bin edges
+
+
+def draw_samples(seed, nominal, tolerances, size, distribution='uniform'):
+    """
+    Draw size samples of every component.
+
+    Parameters:
+    - seed: SeedSequence (or integer) of this batch
+    - nominal: Nominal values under the keys of total_impedance_and_phase
+    - tolerances: Relative tolerance per key; missing keys stay nominal
+    - size: Number of samples
+    - distribution: 'uniform' within +-tolerance, or 'normal' with the
+      tolerance as three standard deviations
+    Returns:
+    - Dictionary of arrays of shape (size,)
+    """
+    rng = np.random.default_rng(seed)
+    samples = {}
+    for key, value in nominal.items():
+        tolerance = tolerances.get(key, 0.0)
+        if distribution == 'uniform':
+            factor = rng.uniform(1 - tolerance, 1 + tolerance, size)
+        elif distribution == 'normal':
+            factor = rng.normal(1, tolerance / 3, size)
+        else:
+            raise ValueError("Distribution must be 'uniform' or 'normal'.")
+        samples[key] = value * factor
+    return samples
+
+
+def _batch_statistics(task):
+    """
+    Histogram counts and moments of |Z| and phase for one batch.
+    """
+    seed, nominal, tolerances, size, distribution, edges = task
+    impedance = complex_impedance(draw_samples(seed, nominal, tolerances, size, distribution))
+    result = {}
+    for name, values in (('magnitude', np.abs(impedance)),
+                         ('phase', np.angle(impedance, deg=True))):
+        counts = np.histogram(values, bins=edges[name])[0]
+        result[name] = {
+            'counts': counts,
+            'below': np.count_nonzero(values < edges[name][0]),
+            'above': np.count_nonzero(values > edges[name][-1]),
+            'count': len(values),
+            'mean': np.mean(values),
+            'deviations': np.sum((values - np.mean(values))**2),
+            'min': np.min(values),
+            'max': np.max(values)
+        }
+    return result
+
+
+def _merge_moments(parts):
+    """
+    Mean and variance of the union of batches from their counts, means and
+    sums of squared deviations.
+    """
+    count, mean, deviations = 0, 0.0, 0.0
+    for part in parts:
+        total = count + part['count']
+        delta = part['mean'] - mean
+        mean += delta * part['count'] / total
+        deviations += part['deviations'] + delta**2 * count * part['count'] / total
+        count = total
+    return mean, deviations / count
+
+
+def histogram_percentiles(edges, counts, percentiles, outside=(0, 0)):
+    """
+    Percentiles (0-100) of a histogram, interpolating linearly within the
+    bin that holds each percentile. outside holds the numbers of samples
+    below and above the bins.
+    """
+    cumulative = outside[0] + np.concatenate([[0], np.cumsum(counts)])
+    targets = (np.asarray(percentiles, dtype=float) / 100
+               * (cumulative[-1] + outside[1]))
+    return np.interp(targets, cumulative, edges)
+
+
+def _pilot_edges(seed, nominal, tolerances, distribution, bins):
+    """
+    Bin edges spanning a pilot batch, widened by a quarter of its range.
+    """
+    impedance = complex_impedance(draw_samples(seed, nominal, tolerances, PILOT_SIZE,
+                                               distribution))
+    edges = {}
+    for name, values in (('magnitude', np.abs(impedance)),
+                         ('phase', np.angle(impedance, deg=True))):
+        low, high = np.min(values), np.max(values)
+        margin = 0.25 * (high - low) or 1e-9 * max(abs(low), 1.0)
+        edges[name] = np.linspace(low - margin, high + margin, bins + 1)
+    return edges
+
+
+def _summary(parts, edges, percentiles):
+    """
+    Merge the statistics of all batches of one quantity.
+    """
+    counts = np.sum([part['counts'] for part in parts], axis=0)
+    outside = (sum(part['below'] for part in parts), sum(part['above'] for part in parts))
+    mean, variance = _merge_moments(parts)
+    return {
+        'mean': mean,
+        'std': np.sqrt(variance),
+        'min': min(part['min'] for part in parts),
+        'max': max(part['max'] for part in parts),
+        'percentiles': dict(zip(percentiles,
+                                histogram_percentiles(edges, counts, percentiles, outside))),
+        'edges': edges,
+        'counts': counts,
+        'below': outside[0],
+        'above': outside[1]
+    }
+
+
+def monte_carlo_impedance(nominal, tolerances, num_samples, options=None):
+    """
+    Run a Monte Carlo tolerance analysis of one circuit.
+
+    Parameters:
+    - nominal: Nominal values under the keys of total_impedance_and_phase
+    - tolerances: Relative tolerance per key
+    - num_samples: Total number of samples
+    - options: Optional dictionary overriding DEFAULT_OPTIONS: 'seed',
+      'batch_size', 'workers' (processes; 1 runs in this process), 'bins',
+      'percentiles' and 'distribution'
+    Returns:
+    - Dictionary with 'count' and, for 'magnitude' and 'phase', a
+      dictionary of 'mean', 'std', 'min', 'max', 'percentiles'
+      ({percentile: value}), 'edges', 'counts' and the numbers of samples
+      'below' and 'above' the histogram range
+    """
+    settings = dict(DEFAULT_OPTIONS)
+    settings.update(options or {})
+    if num_samples < 1:
+        raise ValueError("Number of samples must be at least 1.")
+    if settings['batch_size'] < 1:
+        raise ValueError("Batch size must be at least 1.")
+    full, rest = divmod(num_samples, settings['batch_size'])
+    sizes = [settings['batch_size']] * full + ([rest] if rest else [])
+
+    # child 0 seeds the pilot batch, the others one batch each
+    children = np.random.SeedSequence(settings['seed']).spawn(len(sizes) + 1)
+    edges = _pilot_edges(children[0], nominal, tolerances, settings['distribution'],
+                         settings['bins'])
+    tasks = [(child, nominal, tolerances, size, settings['distribution'], edges)
+             for child, size in zip(children[1:], sizes)]
+
+    if settings['workers'] > 1:
+        with ProcessPoolExecutor(settings['workers']) as pool:
+            batches = list(pool.map(_batch_statistics, tasks))
+    else:
+        batches = [_batch_statistics(task) for task in tasks]
+
+    result = {'count': num_samples}
+    for name in ('magnitude', 'phase'):
+        result[name] = _summary([batch[name] for batch in batches], edges[name],
+                                settings['percentiles'])
+    return result
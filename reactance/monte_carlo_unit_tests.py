@@ -0,0 +1,63 @@
+"""
+monte_carlo_unit_tests.py
+
+This module contains unit tests for the `monte_carlo.py` module: results
+must not depend on the number of workers, and the streamed statistics
+must agree with statistics of the full sample.
+"""
+
+import unittest
+import numpy as np
+from monte_carlo import monte_carlo_impedance, draw_samples
+from reactance import complex_impedance
+
+
+class TestMonteCarlo(unittest.TestCase):
+    """
+    TestMonteCarlo
+
+    Unit tests for reproducible Monte Carlo tolerance analysis.
+    """
+    def setUp(self):
+        self.nominal = {'f': 63.0, 'indc': 0.02, 'capa': 2e-6, 'resistance': 13.0,
+                        'length': 1.5, 'radius': 0.002}
+        self.tolerances = {'indc': 0.1, 'capa': 0.2, 'resistance': 0.05}
+        self.options = {'seed': 42, 'batch_size': 20000}
+
+    def test_workers_do_not_change_results(self):
+        """Test that one and two worker processes give identical results"""
+        single = monte_carlo_impedance(self.nominal, self.tolerances, 50000, self.options)
+        parallel = monte_carlo_impedance(self.nominal, self.tolerances, 50000,
+                                         dict(self.options, workers=2))
+        np.testing.assert_array_equal(single['magnitude']['counts'],
+                                      parallel['magnitude']['counts'])
+        self.assertEqual(single['phase']['mean'], parallel['phase']['mean'])
+
+    def test_streamed_statistics_match_full_sample(self):
+        """Test mean, std and percentiles against the stored samples"""
+        result = monte_carlo_impedance(self.nominal, self.tolerances, 50000, self.options)
+
+        # the same batches, drawn again and kept
+        children = np.random.SeedSequence(42).spawn(4)[1:]
+        magnitude = np.concatenate([
+            np.abs(complex_impedance(draw_samples(child, self.nominal, self.tolerances, size)))
+            for child, size in zip(children, (20000, 20000, 10000))])
+
+        stats = result['magnitude']
+        self.assertAlmostEqual(stats['mean'] / np.mean(magnitude), 1.0, places=10)
+        self.assertAlmostEqual(stats['std'] / np.std(magnitude), 1.0, places=6)
+        width = stats['edges'][1] - stats['edges'][0]
+        for percentile, value in stats['percentiles'].items():
+            self.assertLessEqual(abs(value - np.percentile(magnitude, percentile)), width)
+        self.assertEqual(np.sum(stats['counts']) + stats['below'] + stats['above'], 50000)
+
+    def test_invalid_sizes(self):
+        """Test that empty sample counts and batches raise ValueError"""
+        with self.assertRaises(ValueError):
+            monte_carlo_impedance(self.nominal, self.tolerances, 0, self.options)
+        with self.assertRaises(ValueError):
+            monte_carlo_impedance(self.nominal, self.tolerances, 100, {'batch_size': 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
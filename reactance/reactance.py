@@ -16,10 +16,27 @@ Functions:
 
 The module also handles parasitic reactance, combining inductive and capacitive
 components to compute the total reactance and impedance.
+
+Array versions:
+- inductive_reactance_array, capacitive_reactance_array: Reactances of NumPy
+  arrays, with the same zero-frequency rules.
+- complex_impedance(tip_arrays): Complex impedance R + jX of many segments.
+- compute_segments_vectorized(generator_dict, num_segments, verbose): The
+  array path of compute_segments, evaluating every generator once over all
+  segment indices.
+
+Wire parasitics are looked up in PARASITIC_CACHE (see wire_parasitics.py),
+which holds the 'straight' wire model and the 'ground_plane' model of a
+wire at height 'height' above a conducting plane. The model is chosen by
+the optional 'wire_model' key of tip_dict, 'straight' by default. Both
+models follow the same convention: the inductance carries no length
+factor and the capacitance is that of the whole wire.
 """
 
 import math
 import random
+import numpy as np
+from wire_parasitics import ParasiticCache
 
 # Constants
 MU_0 = 4 * math.pi * 1e-7  # Permeability of free space (H/m)
@@ -52,20 +69,48 @@ def capacitive_reactance(frequency, capacitance):
 def calculate_wire_inductance(length, radius):
     """
     Calculate the parasitic inductance of a straight wire.
+    Works on scalars and NumPy arrays.
     """
     # compute the inductance for this wire segment
-    inductance = (MU_0 / (2 * math.pi)) * math.log(2 * length / radius)
+    inductance = (MU_0 / (2 * math.pi)) * np.log(2 * length / radius)
     return inductance
 
 
 def calculate_wire_capacitance(length, radius):
     """
     Calculate the parasitic capacitance of a straight wire.
+    Works on scalars and NumPy arrays.
     """
-    capa = (2 * math.pi * EPSILON_0 * length) / math.log(2 * length / radius)
+    capa = (2 * math.pi * EPSILON_0 * length) / np.log(2 * length / radius)
     return capa
 
 
+def calculate_ground_plane_inductance(_length, radius, height):
+    """
+    Calculate the parasitic inductance of a straight wire at height
+    above a conducting ground plane (height > radius). Like
+    calculate_wire_inductance it carries no length factor; far from
+    the plane it equals calculate_wire_inductance with length = height.
+    """
+    return (MU_0 / (2 * math.pi)) * np.arccosh(height / radius)
+
+
+def calculate_ground_plane_capacitance(length, radius, height):
+    """
+    Calculate the parasitic capacitance of a straight wire at height
+    above a conducting ground plane (height > radius).
+    """
+    return (2 * math.pi * EPSILON_0 * length) / np.arccosh(height / radius)
+
+
+PARASITIC_CACHE = ParasiticCache()
+PARASITIC_CACHE.register('straight', calculate_wire_inductance,
+                         calculate_wire_capacitance)
+PARASITIC_CACHE.register('ground_plane', calculate_ground_plane_inductance,
+                         calculate_ground_plane_capacitance,
+                         params=('length', 'radius', 'height'))
+
+
 def total_impedance_and_phase(tip_dict):
     """
     Calculate the total impedance (Z) and phase angle (φ) of a circuit,
@@ -76,9 +121,9 @@ def total_impedance_and_phase(tip_dict):
     x_l = inductive_reactance(tip_dict['f'], tip_dict['indc'])
     x_c = capacitive_reactance(tip_dict['f'], tip_dict['capa'])
 
-    # Calculate wire parasitic inductance and capacitance
-    wire_l = calculate_wire_inductance(tip_dict['length'], tip_dict['radius'])
-    wire_c = calculate_wire_capacitance(tip_dict['length'], tip_dict['radius'])
+    # Look up wire parasitic inductance and capacitance by geometry
+    wire_model = tip_dict.get('wire_model', 'straight')
+    wire_l, wire_c = PARASITIC_CACHE.get(wire_model, tip_dict)
 
     # Calculate parasitic reactance for the wire
     wire_x_l = inductive_reactance(tip_dict['f'], wire_l)
@@ -97,10 +142,13 @@ def total_impedance_and_phase(tip_dict):
     return total_impedance, phase_angle_degrees
 
 
-def compute_segments(generator_dict, num_segments):
+def compute_segments(generator_dict, num_segments, verbose=True):
     """
     Compute the impedance and phase angle for a series of segments along a
     wire. Store the computed values in lists for later plotting.
+
+    Every lambda is called once per segment; with verbose=True the values
+    are printed.
     """
     impedance_list = []
     phase_angle_list = []
@@ -108,24 +156,21 @@ def compute_segments(generator_dict, num_segments):
     # use an iterate over each segment
     for i in range(num_segments):
 
-        # print lambda functions and their computed values for this segment
-        print(f"Segment {i+1}:")                  # print the segment number
-        for key, func in generator_dict.items():  # use a dict comprehension
-            value = func(i)                       # get a value from the lambda
-            print(f"  {key}: {value}")            # print the key and value
+        # evaluate every lambda once for this segment
+        values = {key: func(i) for key, func in generator_dict.items()}
 
-        # Calculate the current length for this segment
-        # using the lambda function for length.
-        # NOTE: current_length refers to the length of current segment of wire
-        current_length = generator_dict["length"](i)
+        if verbose:
+            print(f"Segment {i+1}:")              # print the segment number
+            for key, value in values.items():
+                print(f"  {key}: {value}")        # print the key and value
 
         tip_dict = {
-            'f': generator_dict["frequency"](i),
-            'indc': generator_dict["inductance"](i),
-            'capa': generator_dict["capacitance"](i),
-            'resistance': generator_dict["resistance"](i),
-            'length': current_length,
-            'radius': generator_dict["radius"](i)
+            'f': values["frequency"],
+            'indc': values["inductance"],
+            'capa': values["capacitance"],
+            'resistance': values["resistance"],
+            'length': values["length"],
+            'radius': values["radius"]
         }
 
         # Call total_impedance_and_phase for each segment using the generators
@@ -139,6 +184,86 @@ def compute_segments(generator_dict, num_segments):
     return impedance_list, phase_angle_list
 
 
+def inductive_reactance_array(frequency, inductance):
+    """
+    Calculate inductive reactances for arrays of frequencies and
+    inductances; zero frequency gives zero.
+    """
+    return 2 * np.pi * np.asarray(frequency, dtype=float) * inductance
+
+
+def capacitive_reactance_array(frequency, capacitance):
+    """
+    Calculate capacitive reactances for arrays of frequencies and
+    capacitances; zero frequency gives infinity.
+    """
+    with np.errstate(divide='ignore'):
+        return 1 / (2 * np.pi * np.asarray(frequency, dtype=float) * capacitance)
+
+
+def complex_impedance(tip_arrays):
+    """
+    Calculate the complex impedance R + jX of many segments, where
+    tip_arrays holds arrays under the keys of total_impedance_and_phase.
+
+    The real and imaginary parts are set separately, so an infinite
+    reactance at zero frequency gives an infinite imaginary part rather
+    than NaN.
+    """
+    freq = tip_arrays['f']
+    # batches with more geometries than the cache holds bypass it inside evaluate
+    wire_model = tip_arrays.get('wire_model', 'straight')
+    wire_l, wire_c = PARASITIC_CACHE.evaluate(wire_model, tip_arrays)
+    total_reactance = (inductive_reactance_array(freq, tip_arrays['indc'])
+                       + inductive_reactance_array(freq, wire_l)
+                       - capacitive_reactance_array(freq, tip_arrays['capa'])
+                       - capacitive_reactance_array(freq, wire_c))
+
+    shape = np.broadcast(tip_arrays['resistance'], total_reactance).shape
+    impedance = np.empty(shape, dtype=complex)
+    impedance.real = tip_arrays['resistance']
+    impedance.imag = total_reactance
+    return impedance
+
+
+def segment_arrays(generator_dict, num_segments):
+    """
+    Evaluate every entry of generator_dict over np.arange(num_segments).
+
+    Entries are either arrays of length num_segments, used as they are, or
+    functions of the segment index that accept NumPy arrays; scalar results,
+    as from constant lambdas, are broadcast to all segments. Functions that
+    draw one random number per call do not vectorize this way; use
+    compute_segments for them or pass arrays.
+    """
+    index = np.arange(num_segments)
+    return {key: np.broadcast_to(np.asarray(func(index) if callable(func) else func,
+                                            dtype=float), (num_segments,))
+            for key, func in generator_dict.items()}
+
+
+def compute_segments_vectorized(generator_dict, num_segments, verbose=False):
+    """
+    Compute the impedance and phase angle of all segments in one pass of
+    array operations. Returns two NumPy arrays like the lists of
+    compute_segments.
+    """
+    values = segment_arrays(generator_dict, num_segments)
+    if verbose:
+        for key, value in values.items():
+            print(f"  {key}: {value}")
+
+    impedance = complex_impedance({
+        'f': values["frequency"],
+        'indc': values["inductance"],
+        'capa': values["capacitance"],
+        'resistance': values["resistance"],
+        'length': values["length"],
+        'radius': values["radius"]
+    })
+    return np.abs(impedance), np.angle(impedance, deg=True)
+
+
 def main(randomize=False, num_segments=10, dynamic=False):
     """
     Example usage of the total_impedance_and_phase function.
@@ -0,0 +1,161 @@
+"""
+transient.py
+
+This module simulates the time-domain response of the series RLC circuits
+of reactance.py to step and pulse voltages, for many circuits at once.
+
+A circuit with total inductance L (component plus wire), series
+capacitance C (component in series with the wire capacitance, as in
+frequency_sweep.py) and resistance R, driven by a source voltage u(t),
+has the state x = [i, v_C] (loop current and capacitor voltage) and
+
+    dx/dt = A x + B u,   A = [[-R/L, -1/L], [1/C, 0]],   B = [1/L, 0].
+
+With u held constant over every timestep dt (zero-order hold) the exact
+discrete update is
+
+    x_{k+1} = A_d x_k + B_d u_k,   A_d = exp(A dt),   B_d = int_0^dt exp(A s) ds B,
+
+and both come from the exponential of the augmented matrix
+[[A dt, B dt], [0, 0]], whose top-left block is A_d and whose last column
+is B_d. The exponentials of all circuits are computed together by scaling
+and squaring: every matrix is halved until its norm is below EXPM_THETA,
+exponentiated by a Taylor polynomial and squared back. The propagator is
+built once per timestep, and every step is then one batched 2x2
+matrix-vector product over all circuits.
+
+Functions:
+- expm_batch(matrices): Matrix exponentials of a stack of square matrices.
+- state_space(circuits): A and B of every circuit.
+- propagator(circuits, dt): A_d and B_d of every circuit.
+- propagate(matrices, inputs, initial): Advance the states over the inputs.
+- step_input(amplitude, delay), pulse_input(amplitude, width, delay):
+  Source voltages as functions of time.
+- simulate(circuits, dt, num_steps, source): Current and capacitor voltage
+  of every circuit at every timestep.
+"""
+
+import numpy as np
+from frequency_sweep import circuit_arrays
+
+EXPM_THETA = 0.5   # norm below which the Taylor polynomial is used
+EXPM_ORDER = 12    # Taylor order; truncation error ~ theta**13 / 13!
+
+
+def expm_batch(matrices):
+    """
+    Exponentials of a stack of square matrices (..., n, n) by scaling and
+    squaring. Every matrix is squared only as often as its own norm needs.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    norm = np.max(np.sum(np.abs(matrices), axis=-1), axis=-1)
+    with np.errstate(divide='ignore'):
+        squarings = np.maximum(np.ceil(np.log2(norm / EXPM_THETA)), 0).astype(int)
+    scaled = matrices / 2.0**squarings[..., None, None]
+
+    identity = np.eye(matrices.shape[-1])
+    result = np.broadcast_to(identity, matrices.shape).copy()
+    for order in range(EXPM_ORDER, 0, -1):
+        # Horner: I + X/1 (I + X/2 (... (I + X/12)))
+        result = identity + scaled @ result / order
+    for count in range(int(squarings.max(initial=0))):
+        result = np.where((squarings > count)[..., None, None], result @ result, result)
+    return result
+
+
+def state_space(circuits):
+    """
+    Build the state matrices A (C, 2, 2) and input vectors B (C, 2) of
+    every circuit, with circuits described as in frequency_sweep.py.
+    """
+    total_l, inverse_c, resistance = circuit_arrays(circuits)
+    a = np.zeros((len(total_l), 2, 2))
+    a[:, 0, 0] = -resistance / total_l
+    a[:, 0, 1] = -1 / total_l
+    a[:, 1, 0] = inverse_c
+    b = np.zeros((len(total_l), 2))
+    b[:, 0] = 1 / total_l
+    return a, b
+
+
+def propagator(circuits, dt):
+    """
+    Compute the zero-order-hold propagator of every circuit for the
+    timestep dt (s). Returns A_d (C, 2, 2) and B_d (C, 2).
+    """
+    if dt <= 0:
+        raise ValueError("Timestep must be positive.")
+    a, b = state_space(circuits)
+    augmented = np.zeros((len(a), 3, 3))
+    augmented[:, :2, :2] = a * dt
+    augmented[:, :2, 2] = b * dt
+    exponential = expm_batch(augmented)
+    return exponential[:, :2, :2], exponential[:, :2, 2]
+
+
+def propagate(matrices, inputs, initial=None):
+    """
+    Advance the states of all circuits through the input voltages.
+
+    Parameters:
+    - matrices: (A_d, B_d) from propagator
+    - inputs: Source voltage held over every timestep, shape (T,) for all
+      circuits or (T, C)
+    - initial: Initial states [i, v_C], shape (C, 2); zero by default
+    Returns:
+    - Current and capacitor voltage, each of shape (C, T + 1)
+    """
+    a_d, b_d = matrices
+    inputs = np.asarray(inputs, dtype=float)
+    if inputs.ndim == 1:
+        inputs = inputs[:, None]
+    inputs = np.broadcast_to(inputs, (len(inputs), len(a_d)))
+
+    current = np.zeros((len(inputs) + 1, len(a_d)))
+    voltage = np.zeros((len(inputs) + 1, len(a_d)))
+    if initial is not None:
+        current[0], voltage[0] = np.asarray(initial, dtype=float).T
+    for k, source in enumerate(inputs):
+        # one 2x2 matrix-vector product per circuit, written out element by element
+        current[k + 1] = (a_d[:, 0, 0] * current[k] + a_d[:, 0, 1] * voltage[k]
+                          + b_d[:, 0] * source)
+        voltage[k + 1] = (a_d[:, 1, 0] * current[k] + a_d[:, 1, 1] * voltage[k]
+                          + b_d[:, 1] * source)
+    return current.T, voltage.T
+
+
+def step_input(amplitude=1.0, delay=0.0):
+    """
+    Source voltage that switches from 0 to amplitude at time delay.
+    """
+    return lambda time: np.where(time >= delay, amplitude, 0.0)
+
+
+def pulse_input(amplitude=1.0, width=1e-6, delay=0.0):
+    """
+    Rectangular source voltage of amplitude from delay to delay + width.
+    """
+    if width <= 0:
+        raise ValueError("Pulse width must be positive.")
+    return lambda time: np.where((time >= delay) & (time < delay + width), amplitude, 0.0)
+
+
+def simulate(circuits, dt, num_steps, source=None):
+    """
+    Simulate the response of every circuit to a source voltage.
+
+    Parameters:
+    - circuits: Dictionary as in frequency_sweep.py, one entry per circuit
+    - dt: Timestep (s)
+    - num_steps: Number of timesteps
+    - source: Function of the time array returning the source voltage,
+      shape (T,) or (T, C), held over every timestep; a unit step by
+      default
+    Returns:
+    - Dictionary of 'time' (T + 1,), 'current' and 'capacitor_voltage'
+      (C, T + 1), starting from rest
+    """
+    time = dt * np.arange(num_steps + 1)
+    source = source or step_input()
+    current, voltage = propagate(propagator(circuits, dt), source(time[:-1]))
+    return {'time': time, 'current': current, 'capacitor_voltage': voltage}
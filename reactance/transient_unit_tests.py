@@ -0,0 +1,69 @@
+"""
+transient_unit_tests.py
+
+This module contains unit tests for the `transient.py` module: the batched
+matrix exponential is checked against rotations, the step response
+against the closed-form underdamped RLC solution and the pulse response
+against the difference of two steps.
+"""
+
+import unittest
+import numpy as np
+from frequency_sweep import circuit_arrays
+from transient import expm_batch, simulate, step_input, pulse_input
+
+
+class TestTransient(unittest.TestCase):
+    """
+    TestTransient
+
+    Unit tests for state-space transient simulation.
+    """
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        num_circuits = 200
+        self.circuits = {
+            'indc': rng.uniform(0.01, 0.1, num_circuits),
+            'capa': rng.uniform(1e-6, 1e-3, num_circuits),
+            'resistance': rng.uniform(1.0, 100.0, num_circuits),
+            'length': rng.uniform(0.5, 2.0, num_circuits),
+            'radius': rng.uniform(1e-4, 1e-3, num_circuits)
+        }
+        self.dt = 1e-8
+
+    def test_expm_of_rotation_generators(self):
+        """Test exponentials of [[0, -a], [a, 0]], including large a"""
+        angles = np.array([0.0, 0.1, 3.0, 250.0])
+        generators = np.zeros((4, 2, 2))
+        generators[:, 0, 1] = -angles
+        generators[:, 1, 0] = angles
+        expected = np.stack([[np.cos(angles), -np.sin(angles)],
+                             [np.sin(angles), np.cos(angles)]]).transpose(2, 0, 1)
+        np.testing.assert_allclose(expm_batch(generators), expected, atol=1e-11)
+
+    def test_step_response_matches_closed_form(self):
+        """Test the step response against i = V/(L w_d) exp(-a t) sin(w_d t)"""
+        result = simulate(self.circuits, self.dt, 2000, step_input(5.0))
+        total_l, inverse_c, resistance = circuit_arrays(self.circuits)
+        alpha = resistance / (2 * total_l)
+        damped = np.sqrt(inverse_c / total_l - alpha**2)
+        time = result['time']
+        expected = (5.0 / (total_l * damped))[:, None] * np.exp(-alpha[:, None] * time) \
+            * np.sin(damped[:, None] * time)
+        self.assertEqual(result['current'].shape, (200, 2001))
+        np.testing.assert_allclose(result['current'], expected,
+                                   atol=1e-9 * np.max(np.abs(expected)))
+
+    def test_pulse_is_difference_of_steps(self):
+        """Test linearity: a pulse equals a step minus a delayed step"""
+        width = 300 * self.dt
+        pulse = simulate(self.circuits, self.dt, 1000, pulse_input(2.0, width))
+        first = simulate(self.circuits, self.dt, 1000, step_input(2.0))
+        second = simulate(self.circuits, self.dt, 1000, step_input(2.0, width))
+        for key in ('current', 'capacitor_voltage'):
+            np.testing.assert_allclose(pulse[key], first[key] - second[key],
+                                       atol=1e-12 * np.max(np.abs(first[key])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+transmission_line.py
+
+This module treats the segments of compute_segments as one cascaded line
+instead of independent circuits.
+
+Every segment is an L-section two-port: a series impedance
+
+    Z = R + j w (L + L_wire) + 1 / (j w C)
+
+followed by a shunt admittance Y = j w C_wire, where L_wire and C_wire
+are the wire parasitics of the segment's length and radius. Its ABCD
+matrix is
+
+    [[1, Z], [0, 1]] @ [[1, 0], [Y, 1]] = [[1 + Z Y, Z], [Y, 1]]
+
+and the line is the ordered product M_0 @ M_1 @ ... @ M_{N-1}. Matrices are
+stored as complex arrays of shape (F, N, 2, 2) for F frequencies and N
+segments, and the 2x2 products are written out element by element so
+that every frequency and every pair of segments is multiplied at once.
+cascade reduces the segments as a balanced tree (log2 N batched passes),
+prefix_cascade computes all partial products M_0 @ ... @ M_k with a
+Hillis-Steele parallel-prefix scan, which gives the voltage at every
+node.
+
+Functions:
+- segment_abcd(frequencies, segments): ABCD matrices of every segment.
+- cascade(matrices): Product over the segment axis.
+- prefix_cascade(matrices): All partial products over the segment axis.
+- input_impedance(total, load): Impedance seen at the input.
+- voltage_transfer(total, load, source): V_load / V_source.
+- node_voltages(matrices, load): V_k / V_in at every segment output.
+"""
+
+import numpy as np
+from reactance import PARASITIC_CACHE
+
+
+def _matmul2(left, right):
+    """
+    Products of stacks of 2x2 matrices, written out element by element.
+    """
+    out = np.empty(np.broadcast_shapes(left.shape, right.shape), dtype=complex)
+    out[..., 0, 0] = left[..., 0, 0] * right[..., 0, 0] + left[..., 0, 1] * right[..., 1, 0]
+    out[..., 0, 1] = left[..., 0, 0] * right[..., 0, 1] + left[..., 0, 1] * right[..., 1, 1]
+    out[..., 1, 0] = left[..., 1, 0] * right[..., 0, 0] + left[..., 1, 1] * right[..., 1, 0]
+    out[..., 1, 1] = left[..., 1, 0] * right[..., 0, 1] + left[..., 1, 1] * right[..., 1, 1]
+    return out
+
+
+def segment_abcd(frequencies, segments):
+    """
+    Build the ABCD matrices of all segments at all frequencies.
+
+    Parameters:
+    - frequencies: Frequencies (Hz), shape (F,), all positive
+    - segments: Dictionary of 'indc', 'capa', 'resistance', 'length' and
+      'radius' (plus an optional 'wire_model'), arrays of shape (N,) or
+      scalars, as the tip_dict keys of total_impedance_and_phase
+    Returns:
+    - Complex array of shape (F, N, 2, 2)
+    """
+    wire_l, wire_c = PARASITIC_CACHE.evaluate(segments.get('wire_model', 'straight'), segments)
+    omega = 2 * np.pi * np.asarray(frequencies, dtype=float)[:, None]
+    series = (np.asarray(segments['resistance'], dtype=float)
+              + 1j * omega * (np.asarray(segments['indc'], dtype=float) + wire_l)
+              + 1 / (1j * omega * np.asarray(segments['capa'], dtype=float)))
+    shunt = 1j * omega * wire_c
+    series, shunt = np.broadcast_arrays(series, shunt)
+
+    matrices = np.empty(series.shape + (2, 2), dtype=complex)
+    matrices[..., 0, 0] = 1 + series * shunt
+    matrices[..., 0, 1] = series
+    matrices[..., 1, 0] = shunt
+    matrices[..., 1, 1] = 1
+    return matrices
+
+
+def cascade(matrices):
+    """
+    Multiply the matrices (..., N, 2, 2) in order along the segment axis
+    by pairwise tree reduction. Returns shape (..., 2, 2).
+    """
+    while matrices.shape[-3] > 1:
+        pairs = matrices.shape[-3] // 2
+        reduced = _matmul2(matrices[..., 0:2 * pairs:2, :, :],
+                           matrices[..., 1:2 * pairs:2, :, :])
+        if matrices.shape[-3] % 2:
+            # an odd segment left over stays last
+            reduced = np.concatenate([reduced, matrices[..., -1:, :, :]], axis=-3)
+        matrices = reduced
+    return matrices[..., 0, :, :]
+
+
+def prefix_cascade(matrices):
+    """
+    Compute all partial products M_0 @ ... @ M_k along the segment axis
+    with a Hillis-Steele scan of log2 N batched passes.
+    Returns the same shape as matrices.
+    """
+    prefix = matrices.copy()
+    step = 1
+    while step < prefix.shape[-3]:
+        updated = prefix.copy()
+        updated[..., step:, :, :] = _matmul2(prefix[..., :-step, :, :],
+                                             prefix[..., step:, :, :])
+        prefix = updated
+        step *= 2
+    return prefix
+
+
+def input_impedance(total, load=None):
+    """
+    Input impedance of a two-port (..., 2, 2) terminated by load
+    (Ohms); load=None is an open circuit.
+    """
+    a, b, c, d = total[..., 0, 0], total[..., 0, 1], total[..., 1, 0], total[..., 1, 1]
+    if load is None:
+        return a / c
+    return (a * load + b) / (c * load + d)
+
+
+def voltage_transfer(total, load=None, source=0.0):
+    """
+    Voltage at the load divided by the source voltage, for a source with
+    internal impedance source; load=None is an open circuit.
+    """
+    a, b, c, d = total[..., 0, 0], total[..., 0, 1], total[..., 1, 0], total[..., 1, 1]
+    if load is None:
+        return 1 / (a + source * c)
+    return load / (a * load + b + source * (c * load + d))
+
+
+def node_voltages(matrices, load=None):
+    """
+    Voltage at the output of every segment divided by the input voltage,
+    shape (..., N), from the prefix products of matrices (..., N, 2, 2).
+    """
+    prefix = prefix_cascade(matrices)
+    current_in = 1 / input_impedance(prefix[..., -1, :, :], load)
+    # ABCD matrices of passive reciprocal two-ports have determinant 1,
+    # so [V_k, I_k] = [[D, -B], [-C, A]] @ [V_in, I_in]
+    return prefix[..., 1, 1] - prefix[..., 0, 1] * current_in[..., None]
@@ -0,0 +1,73 @@
+"""
+transmission_line_unit_tests.py
+
+This module contains unit tests for the `transmission_line.py` module: the
+tree and prefix cascades are checked against sequential matrix products
+and the input impedance and transfer functions against a single L-section
+solved by hand.
+"""
+
+import unittest
+import numpy as np
+from transmission_line import (segment_abcd, cascade, prefix_cascade, input_impedance,
+                               voltage_transfer, node_voltages)
+from reactance import calculate_wire_inductance, calculate_wire_capacitance
+
+
+class TestTransmissionLine(unittest.TestCase):
+    """
+    TestTransmissionLine
+
+    Unit tests for ABCD cascades of line segments.
+    """
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        num_segments = 37
+        self.segments = {
+            'indc': rng.uniform(1e-7, 1e-6, num_segments),
+            'capa': rng.uniform(1e-6, 1e-3, num_segments),
+            'resistance': rng.uniform(0.01, 0.1, num_segments),
+            'length': rng.uniform(0.1, 1.0, num_segments),
+            'radius': rng.uniform(1e-4, 1e-3, num_segments)
+        }
+        self.frequencies = np.geomspace(1e3, 1e7, 5)
+        self.matrices = segment_abcd(self.frequencies, self.segments)
+
+    def test_cascades_match_sequential_products(self):
+        """Test tree and prefix products against a loop of np.matmul"""
+        expected = np.broadcast_to(np.eye(2, dtype=complex), (5, 2, 2))
+        partial = []
+        for k in range(self.matrices.shape[1]):
+            expected = expected @ self.matrices[:, k]
+            partial.append(expected)
+        np.testing.assert_allclose(cascade(self.matrices), expected, rtol=1e-9)
+        np.testing.assert_allclose(prefix_cascade(self.matrices), np.stack(partial, axis=1),
+                                   rtol=1e-9)
+
+    def test_single_section(self):
+        """Test input impedance and transfer of one L-section by hand"""
+        segment = {key: value[:1] for key, value in self.segments.items()}
+        omega = 2 * np.pi * self.frequencies
+        series = (segment['resistance'] + 1j * omega * (
+            segment['indc'] + calculate_wire_inductance(segment['length'], segment['radius']))
+                  + 1 / (1j * omega * segment['capa']))
+        shunt = 1j * omega * calculate_wire_capacitance(segment['length'], segment['radius'])
+        load = 50.0
+        parallel = 1 / (shunt + 1 / load)
+
+        total = cascade(segment_abcd(self.frequencies, segment))
+        np.testing.assert_allclose(input_impedance(total, load), series + parallel, rtol=1e-12)
+        np.testing.assert_allclose(voltage_transfer(total, load),
+                                   parallel / (series + parallel), rtol=1e-12)
+        np.testing.assert_allclose(input_impedance(total), series + 1 / shunt, rtol=1e-12)
+
+    def test_node_voltages_end_at_load(self):
+        """Test that the last node voltage equals the voltage transfer"""
+        voltages = node_voltages(self.matrices, 50.0)
+        self.assertEqual(voltages.shape, (5, 37))
+        np.testing.assert_allclose(voltages[:, -1],
+                                   voltage_transfer(cascade(self.matrices), 50.0), rtol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
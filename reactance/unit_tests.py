@@ -13,13 +13,16 @@ The tests cover:
 
 import unittest
 import math
+import numpy as np
 from reactance import (
     inductive_reactance,
     capacitive_reactance,
     calculate_wire_inductance,
     calculate_wire_capacitance,
     total_impedance_and_phase,
-    compute_segments
+    compute_segments,
+    compute_segments_vectorized,
+    complex_impedance
 )
 
 
@@ -180,6 +183,42 @@ class TestReactanceCalculations(unittest.TestCase):
             self.assertGreater(impedance, 0)
             self.assertTrue(-90 <= phase_angle <= 90)
 
+    def test_vectorized_matches_loop(self):
+        """Test that the array path reproduces compute_segments"""
+        generator_dict_dynamic = {
+            "frequency": lambda i: 60 + 2 * i**2,
+            "inductance": lambda i: 0.02 + 0.0002 * i,
+            "capacitance": lambda i: 2e-6 + 1e-12 * i**2,
+            "resistance": lambda i: 5 + 0.2 * i,
+            "length": lambda i: 0.5 + 0.1 * i,
+            "radius": lambda i: 0.002 + 1e-5 * i
+        }
+        il, pal = compute_segments(generator_dict_dynamic, 200, verbose=False)
+        iv, pav = compute_segments_vectorized(generator_dict_dynamic, 200)
+        np.testing.assert_allclose(iv, il, rtol=1e-12)
+        np.testing.assert_allclose(pav, pal, rtol=1e-12, atol=1e-12)
+
+        # constant lambdas are broadcast to every segment
+        iv, pav = compute_segments_vectorized(self.generator_dict_static,
+                                              self.num_segments)
+        il, pal = compute_segments(self.generator_dict_static,
+                                   self.num_segments, verbose=False)
+        np.testing.assert_allclose(iv, il, rtol=1e-12)
+
+    def test_complex_impedance_zero_frequency(self):
+        """Test that zero frequency gives an infinite reactance, not NaN"""
+        impedance = complex_impedance({
+            'f': np.array([0.0, 60.0]),
+            'indc': 0.01,
+            'capa': 1e-6,
+            'resistance': np.array([10.0, 10.0]),
+            'length': 1.0,
+            'radius': 0.001
+        })
+        self.assertEqual(impedance[0].real, 10.0)
+        self.assertEqual(impedance[0].imag, -np.inf)
+        self.assertTrue(np.all(np.isfinite(impedance[1])))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,173 @@
+"""
+wire_parasitics.py
+
+This module caches the parasitic inductance and capacitance of wires,
+which depend only on the wire geometry, so that repeated geometries are
+computed once.
+
+A wire model is registered under a name with two functions, inductance and
+capacitance, and the names of the geometry parameters they take in order
+(for example 'length' and 'radius'). The functions must accept NumPy
+arrays. Results are looked up by (model, geometry) in a bounded
+least-recently-used cache that counts hits and misses.
+
+Array inputs are reduced to their unique geometries first; only the
+unique geometries missing from the cache are computed, in one vectorized
+call, and the results are scattered back to the full arrays. Batches whose
+first rows already hold more unique geometries than the cache can keep
+bypass the cache and are computed directly, so sweeps over continuously
+varying geometries pay nothing for the lookup.
+
+The models themselves (straight wire, wire over a ground plane) are
+registered by reactance.py.
+"""
+
+from collections import OrderedDict
+import numpy as np
+
+SAMPLE_FACTOR = 8  # rows sampled per cache entry to detect uncacheable batches
+
+
+def _unique_rows(columns):
+    """
+    Unique rows of equally long 1D columns: the unique values of every
+    column and, for every row, the index of its unique row.
+    """
+    key = np.zeros(len(columns[0]), dtype=np.int64)
+    for column in columns:
+        values, codes = np.unique(column, return_inverse=True)
+        largest = int(key.max()) if len(key) else 0
+        if (largest + 1) * len(values) >= 2**62:
+            key = np.unique(key, return_inverse=True)[1].ravel()
+        key = key * len(values) + codes.ravel()
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    return [column[first] for column in columns], inverse.ravel()
+
+
+class ParasiticCache:
+    """
+    ParasiticCache
+
+    Bounded LRU cache of (inductance, capacitance) per wire model and
+    geometry, with hit/miss statistics.
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.models = {}
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def register(self, name, inductance, capacitance, params=('length', 'radius')):
+        """
+        Register a wire model. inductance and capacitance are functions of
+        the geometry parameters named in params, in that order.
+        """
+        self.models[name] = (inductance, capacitance, tuple(params))
+
+    def _store(self, key, value):
+        """Insert an entry and evict the least recently used ones."""
+        self._entries[key] = value
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, name, geometry):
+        """
+        Return (inductance, capacitance) of one wire. geometry is a
+        dictionary holding at least the model's parameters, such as the
+        tip_dict of total_impedance_and_phase.
+        """
+        inductance, capacitance, params = self.models[name]
+        values = tuple(float(geometry[param]) for param in params)
+        key = (name,) + values
+        if key in self._entries:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self._misses += 1
+        result = (float(inductance(*values)), float(capacitance(*values)))
+        self._store(key, result)
+        return result
+
+    def compute(self, name, geometry):
+        """
+        Return (inductance, capacitance) arrays without using the cache,
+        for arrays of geometry parameters. Cheaper than evaluate when
+        nearly every row holds a different geometry.
+        """
+        inductance, capacitance, params = self.models[name]
+        columns = [np.asarray(geometry[param], dtype=float) for param in params]
+        return inductance(*columns), capacitance(*columns)
+
+    def evaluate(self, name, geometry):
+        """
+        Return (inductance, capacitance) arrays for arrays of geometry
+        parameters, which are broadcast together.
+        """
+        inductance, capacitance, params = self.models[name]
+        columns = np.broadcast_arrays(*(np.asarray(geometry[param], dtype=float)
+                                        for param in params))
+        shape = columns[0].shape
+        columns = [column.ravel() for column in columns]
+
+        sample = [column[:SAMPLE_FACTOR * self.maxsize] for column in columns]
+        if len(_unique_rows(sample)[0][0]) > self.maxsize:
+            # too many geometries to cache: compute every row directly
+            self._misses += len(columns[0])
+            return (np.broadcast_to(inductance(*columns), columns[0].shape).reshape(shape),
+                    np.broadcast_to(capacitance(*columns), columns[0].shape).reshape(shape))
+
+        unique, inverse = _unique_rows(columns)
+        if len(unique[0]) > self.maxsize:
+            self._misses += len(unique[0])
+            wire_l = inductance(*unique)
+            wire_c = capacitance(*unique)
+        else:
+            wire_l, wire_c = self._lookup(name, unique)
+        return wire_l[inverse].reshape(shape), wire_c[inverse].reshape(shape)
+
+    def _lookup(self, name, unique):
+        """
+        Cached values for unique geometry columns; the missing ones are
+        computed in one vectorized call and stored.
+        """
+        inductance, capacitance = self.models[name][:2]
+        rows = list(zip(*(column.tolist() for column in unique)))
+        wire_l = np.empty(len(rows))
+        wire_c = np.empty(len(rows))
+        missing = []
+        for index, row in enumerate(rows):
+            key = (name,) + row
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                wire_l[index], wire_c[index] = self._entries[key]
+            else:
+                missing.append(index)
+        self._hits += len(rows) - len(missing)
+        self._misses += len(missing)
+        if missing:
+            wire_l[missing] = inductance(*(column[missing] for column in unique))
+            wire_c[missing] = capacitance(*(column[missing] for column in unique))
+            for index in missing:
+                self._store((name,) + rows[index], (float(wire_l[index]), float(wire_c[index])))
+        return wire_l, wire_c
+
+    def stats(self):
+        """
+        Return a dictionary of 'hits', 'misses', 'hit_rate', 'size' and
+        'maxsize'.
+        """
+        lookups = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
@@ -0,0 +1,100 @@
+"""
+wire_parasitics_unit_tests.py
+
+This module contains unit tests for the `wire_parasitics.py` cache and the
+wire models registered by `reactance.py`.
+"""
+
+import unittest
+import numpy as np
+from wire_parasitics import ParasiticCache
+from reactance import (
+    PARASITIC_CACHE,
+    calculate_wire_inductance,
+    calculate_wire_capacitance,
+    calculate_ground_plane_inductance,
+    complex_impedance,
+    total_impedance_and_phase
+)
+
+
+class TestParasiticCache(unittest.TestCase):
+    """
+    TestParasiticCache
+
+    Unit tests for LRU eviction, statistics, array evaluation and wire
+    models behind the cache.
+    """
+    def setUp(self):
+        self.cache = ParasiticCache(maxsize=2)
+        self.cache.register('straight', calculate_wire_inductance,
+                            calculate_wire_capacitance)
+
+    def test_hits_misses_and_eviction(self):
+        """Test statistics and least-recently-used eviction"""
+        geometries = [{'length': 1.0, 'radius': 0.001},
+                      {'length': 2.0, 'radius': 0.001},
+                      {'length': 3.0, 'radius': 0.001}]
+        self.cache.get('straight', geometries[0])
+        self.cache.get('straight', geometries[1])
+        self.cache.get('straight', geometries[0])   # hit, now most recent
+        self.cache.get('straight', geometries[2])   # evicts geometries[1]
+        self.cache.get('straight', geometries[0])   # still cached
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (2, 3, 2))
+        self.cache.get('straight', geometries[1])
+        self.assertEqual(self.cache.stats()['misses'], 4)
+
+    def test_evaluate_unique_then_scatter(self):
+        """Test that arrays of repeated geometries compute each one once"""
+        self.cache.maxsize = 16
+        length = np.tile([1.0, 2.0, 3.0], 1000)
+        radius = np.repeat([0.001, 0.002], 1500)
+        wire_l, wire_c = self.cache.evaluate('straight', {'length': length, 'radius': radius})
+        np.testing.assert_allclose(wire_l, calculate_wire_inductance(length, radius))
+        np.testing.assert_allclose(wire_c, calculate_wire_capacitance(length, radius))
+        self.assertEqual(self.cache.stats()['misses'], 6)
+
+        self.cache.evaluate('straight', {'length': length, 'radius': radius})
+        self.assertEqual(self.cache.stats()['hits'], 6)
+
+    def test_evaluate_bypasses_uncacheable_batches(self):
+        """Test that batches of distinct geometries are computed directly"""
+        length = np.linspace(1, 2, 100)
+        wire_l, _ = self.cache.evaluate('straight', {'length': length, 'radius': 0.001})
+        np.testing.assert_allclose(wire_l, calculate_wire_inductance(length, 0.001))
+        self.assertEqual(self.cache.stats()['size'], 0)
+
+    def test_complex_impedance_uses_the_cache(self):
+        """Test that complex_impedance looks up repeated geometries in the cache"""
+        tip_arrays = {'f': 60.0, 'indc': 0.01, 'capa': 1e-6, 'resistance': 10.0,
+                      'length': np.tile([1.25, 2.25, 3.25], 500), 'radius': 7e-4}
+        complex_impedance(tip_arrays)
+        before = PARASITIC_CACHE.stats()
+        impedance = complex_impedance(tip_arrays)
+        after = PARASITIC_CACHE.stats()
+        self.assertEqual((after['hits'] - before['hits'], after['misses'] - before['misses']),
+                         (3, 0))
+        self.assertEqual(impedance.shape, (1500,))
+
+    def test_ground_plane_model(self):
+        """Test a wire over a ground plane through total_impedance_and_phase"""
+        tip_dict = {'f': 60.0, 'indc': 0.01, 'capa': 1e-6, 'resistance': 10.0,
+                    'length': 1.0, 'radius': 0.001, 'height': 0.01,
+                    'wire_model': 'ground_plane'}
+        total_z, _ = total_impedance_and_phase(tip_dict)
+        wire_l, _ = PARASITIC_CACHE.get('ground_plane', tip_dict)
+        self.assertAlmostEqual(wire_l, calculate_ground_plane_inductance(1.0, 0.001, 0.01))
+        self.assertGreater(total_z, 10.0)
+
+    def test_ground_plane_far_limit(self):
+        """Test that far from the plane both models agree for length = height"""
+        height = np.array([0.1, 1.0, 10.0])
+        straight = PARASITIC_CACHE.compute('straight', {'length': height, 'radius': 1e-4})
+        plane = PARASITIC_CACHE.compute('ground_plane',
+                                        {'length': height, 'radius': 1e-4, 'height': height})
+        np.testing.assert_allclose(plane, straight, rtol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+"""
+sphere_superposition adds up the electric fields of many uniformly
+charged spheres, each described as in electricSphere by a center, a
+charge density and a radius.
+
+The sphere centers are sorted into a uniform grid of cubic cells. The
+occupied cells are kept in Morton (Z) order, so the cell key -> sphere
+range map is a sorted array of keys with the start and count of every
+cell's spheres, looked up with searchsorted. Groups of 2x2x2 cells are
+merged level by level into a hierarchy that ends in one root node;
+every node keeps the total charge of its spheres, their charge center
+and a bounding radius that contains all of them.
+
+The field at a query point is found by walking the hierarchy from the
+root. A node is far when
+
+    bounding radius < theta * distance to the charge center
+
+and its spheres are then replaced by one point charge; otherwise its
+children are visited. Spheres in near leaf cells are added exactly, with
+the inside/outside selection of elec_field_points. theta must satisfy
+0 <= theta < 1, so that a node containing the point is never far;
+theta = 0 makes every node near, so the sum is exact. Larger theta trades
+accuracy for speed (the error of a far node falls off like theta squared
+for charges of one sign).
+
+containing only visits the query point's cell and the neighbouring cells
+within the largest sphere radius.
+"""
+import numpy as np
+from electricSphere import EPS, get_qe
+
+SPHERES_PER_CELL = 16 #average number of spheres per occupied grid cell
+CHUNK_POINTS = 512 #query points evaluated together
+CHUNK_PAIRS = 2**18 #point-sphere pairs evaluated together
+MORTON_BITS = 21 #bits per axis of a cell coordinate in a Morton key
+
+def _sphere_fields(sep, cd, r):
+    """_sphere_fields returns the fields of spheres with
+    charge densities cd and radii r at separations sep (K,3)
+    """
+    m=np.sqrt(np.einsum('ij,ij->i',sep,sep))
+    outside=m>r
+    scale=np.ones_like(m)
+    scale[outside]=(r[outside]/m[outside])**3
+    return sep*(scale*cd/(3*EPS))[:,None]
+
+def _morton(coords):
+    """_morton interleaves the bits of integer cell
+    coordinates (...,3) into Morton keys
+    """
+    key=np.zeros(coords.shape[:-1],dtype=np.int64)
+    for axis in range(3):
+        #spread the bits of one axis two apart
+        spread=coords[...,axis].astype(np.int64)&0x1fffff
+        for shift,mask in ((32,0x1f00000000ffff),(16,0x1f0000ff0000ff),
+                           (8,0x100f00f00f00f00f),(4,0x10c30c30c30c30c3),
+                           (2,0x1249249249249249)):
+            spread=(spread|spread<<shift)&mask
+        key|=spread<<axis
+    return key
+
+def _children(p_idx, node, start, count):
+    """_children returns (point index, child index) pairs for
+    every child of the nodes paired with points
+    """
+    counts=count[node]
+    offsets=np.arange(counts.sum())-np.repeat(np.cumsum(counts)-counts,counts)
+    return np.repeat(p_idx,counts),np.repeat(start[node],counts)+offsets
+
+class SphereGrid:
+    """
+    SphereGrid is a uniform-grid index over sphere centers with a
+    hierarchy of merged cells that evaluates the superposed field
+    of all spheres.
+    """
+
+    def __init__(self, centers, cd, r, cell_size=None):
+        """
+        centers: sphere centers, (S,3)
+        cd: charge densities, (S,) or a scalar
+        r: radii, (S,) or a scalar
+        cell_size: edge of a grid cell; by default chosen so that
+            occupied cells hold about SPHERES_PER_CELL spheres
+        """
+        centers=np.asarray(centers,dtype=float)
+        cd=np.broadcast_to(np.asarray(cd,dtype=float),(len(centers),))
+        r=np.broadcast_to(np.asarray(r,dtype=float),(len(centers),))
+        if np.any(r<=0):
+            raise ValueError("Sphere radii must be positive numbers.")
+
+        self.low=centers.min(axis=0)
+        if cell_size is None:
+            extent=max(np.max(centers.max(axis=0)-self.low),np.max(r))
+            cell_size=extent/max(1.0,np.cbrt(len(centers)/SPHERES_PER_CELL))
+        self.cell_size=cell_size
+        cells=np.floor((centers-self.low)/cell_size).astype(np.int64)
+        if np.max(cells)>=2**MORTON_BITS:
+            raise ValueError("Too many grid cells per axis; use a larger cell_size.")
+        keys=_morton(cells)
+
+        #spheres sorted by cell, each cell a contiguous slice
+        order=np.argsort(keys,kind='stable')
+        self.centers,self.cd,self.r=centers[order],cd[order],r[order]
+        key,start,count=np.unique(keys[order],return_index=True,return_counts=True)
+        self.cells={'key':key,'start':start,'count':count,'coords':cells[order][start]}
+        self.levels=self._hierarchy()
+
+    def _merge(self, nodes, centers, radii, parent_of):
+        """_merge returns the total 'charge', |charge| 'weight',
+        |charge|-weighted 'center' and bounding 'radius' of the
+        parents of nodes (or spheres) with charges nodes['charge'],
+        weights nodes['weight'], centers and bounding radii
+        """
+        charge=np.bincount(parent_of,weights=nodes['charge'])
+        weight=np.bincount(parent_of,weights=nodes['weight'])
+        center=np.stack([np.bincount(parent_of,weights=nodes['weight']*centers[:,k])
+                         for k in range(3)],axis=1)/weight[:,None]
+        reach=np.linalg.norm(centers-center[parent_of],axis=1)+radii
+        start=np.flatnonzero(np.diff(parent_of,prepend=-1))
+        return {'charge':charge,'weight':weight,'center':center,
+                'radius':np.maximum.reduceat(reach,start)}
+
+    def _hierarchy(self):
+        """_hierarchy returns the list of node levels from the leaf
+        cells up to the single root. Every level is a dictionary of
+        node 'key', the 'start' and 'count' of its children in the
+        level below (of its spheres for the leaves), and the
+        'charge', 'weight', 'center' and 'radius' of _merge
+        """
+        charge=get_qe()(self.cd,self.r)
+        spheres={'charge':charge,'weight':np.abs(charge)+np.finfo(float).tiny}
+        leaves=dict(self.cells)
+        leaves.update(self._merge(spheres,self.centers,self.r,
+                                  np.repeat(np.arange(len(leaves['key'])),leaves['count'])))
+        levels=[leaves]
+        while len(levels[-1]['key'])>1:
+            below=levels[-1]
+            key,start,count=np.unique(below['key']>>3,return_index=True,return_counts=True)
+            parents={'key':key,'start':start,'count':count}
+            parents.update(self._merge(below,below['center'],below['radius'],
+                                       np.repeat(np.arange(len(key)),count)))
+            levels.append(parents)
+        return levels
+
+    def _sphere_pairs(self, p_all, c_all):
+        """_sphere_pairs yields (point index, sphere index) arrays
+        for every sphere of the leaf cells c_all paired with the
+        points p_all, in batches of about CHUNK_PAIRS pairs
+        """
+        batch=np.cumsum(self.cells['count'][c_all])//CHUNK_PAIRS
+        bounds=np.searchsorted(batch,np.arange(batch[-1]+2)) if len(batch) else [0]
+        for first,last in zip(bounds[:-1],bounds[1:]):
+            yield _children(p_all[first:last],c_all[first:last],
+                            self.cells['start'],self.cells['count'])
+
+    def _walk(self, chunk, theta, total):
+        """_walk adds the point-charge fields of far nodes for the
+        points chunk to total and returns the (point index, leaf
+        cell) pairs that are near
+        """
+        p_idx=np.arange(len(chunk))
+        node=np.zeros(len(chunk),dtype=np.int64)
+        for depth in range(len(self.levels)-1,-1,-1):
+            nodes=self.levels[depth]
+            sep=chunk[p_idx]-nodes['center'][node]
+            dist=np.linalg.norm(sep,axis=1)
+            far=nodes['radius'][node]<theta*dist
+
+            #far nodes as point charges
+            scale=nodes['charge'][node[far]]/(4*np.pi*EPS*dist[far]**3)
+            for k in range(3):
+                total[:,k]+=np.bincount(p_idx[far],weights=scale*sep[far,k],
+                                        minlength=len(chunk))
+            p_idx,node=p_idx[~far],node[~far]
+            if depth>0:
+                p_idx,node=_children(p_idx,node,nodes['start'],nodes['count'])
+        return p_idx,node
+
+    def field(self, points, theta=0.0):
+        """
+        field returns the electric field (V/m) of all spheres at
+        points (M,3) as an (M,3) array. theta (0 <= theta < 1) is
+        the opening parameter of the point-charge approximation;
+        0 is exact.
+        """
+        if not 0<=theta<1:
+            raise ValueError("theta must satisfy 0 <= theta < 1.")
+        points=np.atleast_2d(np.asarray(points,dtype=float))
+        result=np.zeros_like(points)
+        for start in range(0,len(points),CHUNK_POINTS):
+            chunk=points[start:start+CHUNK_POINTS]
+            total=result[start:start+len(chunk)]
+
+            #near leaf cells sphere by sphere
+            for p_idx,s_idx in self._sphere_pairs(*self._walk(chunk,theta,total)):
+                exact=_sphere_fields(chunk[p_idx]-self.centers[s_idx],
+                                     self.cd[s_idx],self.r[s_idx])
+                for k in range(3):
+                    total[:,k]+=np.bincount(p_idx,weights=exact[:,k],minlength=len(chunk))
+        return result
+
+    def _neighbours(self, chunk, offsets):
+        """_neighbours returns (point index, leaf cell) pairs of the
+        occupied cells at the given offsets from each point's cell
+        whose bounding sphere holds the point
+        """
+        coords=(np.floor((chunk-self.low)/self.cell_size).astype(np.int64)[:,None,:]
+                +offsets[None])
+        p_all,o_all=np.nonzero(np.all((coords>=0)&(coords<2**MORTON_BITS),axis=2))
+        keys=_morton(coords[p_all,o_all])
+        cell=np.minimum(np.searchsorted(self.cells['key'],keys),len(self.cells['key'])-1)
+        occupied=self.cells['key'][cell]==keys
+        p_all,cell=p_all[occupied],cell[occupied]
+        inside=(np.linalg.norm(chunk[p_all]-self.levels[0]['center'][cell],axis=1)
+                <=self.levels[0]['radius'][cell])
+        return p_all[inside],cell[inside]
+
+    def containing(self, points):
+        """
+        containing returns the index (into the sorted arrays
+        self.centers, self.cd and self.r) of a sphere that contains
+        every point, or -1 for points outside all spheres. Only the
+        point's cell and its neighbours within the largest radius
+        are searched.
+        """
+        points=np.atleast_2d(np.asarray(points,dtype=float))
+        result=np.full(len(points),-1)
+        reach=int(np.ceil(np.max(self.r)/self.cell_size))
+        steps=np.arange(-reach,reach+1)
+        offsets=np.stack(np.meshgrid(steps,steps,steps,indexing='ij'),axis=-1).reshape(-1,3)
+        chunk_size=max(1,CHUNK_PAIRS//len(offsets))
+        for start in range(0,len(points),chunk_size):
+            chunk=points[start:start+chunk_size]
+            for p_idx,s_idx in self._sphere_pairs(*self._neighbours(chunk,offsets)):
+                hit=np.linalg.norm(chunk[p_idx]-self.centers[s_idx],axis=1)<=self.r[s_idx]
+                result[start+p_idx[hit]]=s_idx[hit]
+        return result
@@ -0,0 +1,111 @@
+"""
+This module evaluates the fields inside layered spherical capacitors.
+
+With charge Q = C V on the inner conductor, Gauss's law gives in every
+layer
+
+    D(r) = Q / (4 pi r^2),   E(r) = D / (eps_0 eps_r),   u(r) = E D / 2
+
+and all three vanish outside the conductors. Within a layer E is largest
+at its inner radius r1, so a layer with breakdown field E_bd withstands
+
+    V_max = E_bd 4 pi eps_0 eps_r r1^2 / C
+
+and the safe voltage of a design is the minimum over its layers. Both are
+evaluated for batches of geometries in the layer arrays of
+layered_capacitor.py; invalid geometries give NaN.
+
+Functions:
+- field_profile(inner_r, outer_r, dielectrics, voltage, radii): Profiles
+  of one capacitor described by layer dictionaries.
+- field_profiles(inner_r, outer_r, layers, voltage, radii): Profiles of G
+  capacitors over a radius grid.
+- max_safe_voltage(inner_r, outer_r, layers, breakdown_field): Largest
+  voltage without dielectric breakdown, per geometry.
+"""
+import numpy as np
+from spherical_capacitor import EPSILON_0
+from layered_capacitor import (layers_from_dicts, layered_spherical_capacitance_batch,
+                               sort_layers)
+
+
+def _sorted_layers(capacitance, layers):
+    # layers as sorted (G, L) arrays matching the batch of capacitances
+    shape = (len(capacitance), np.shape(layers[0])[-1])
+    layer_inner, layer_outer, epsilon_r = (np.broadcast_to(np.asarray(a, dtype=float), shape)
+                                           for a in layers)
+    return sort_layers(layer_inner, layer_outer, epsilon_r)
+
+
+def field_profiles(inner_r, outer_r, layers, voltage, radii):
+    '''
+    Evaluate E(r), D(r) and the energy density over a radius grid.
+
+    Parameters:
+    - inner_r, outer_r: Radii of the conductors (meters), shape (G,) or scalar
+    - layers: Tuple (layer_inner, layer_outer, epsilon_r) as in
+      layered_capacitor.layered_spherical_capacitance, with at least one layer
+    - voltage: Voltage between the conductors (volts), shape (G,) or scalar
+    - radii: Radius grid (meters), shape (R,) or (G, R); at a layer boundary
+      the inner layer is used
+    Returns:
+    - Dictionary of 'electric_field' (V/m), 'displacement' (C/m^2) and
+      'energy_density' (J/m^3), each of shape (G, R)
+    '''
+    capacitance, _ = layered_spherical_capacitance_batch(inner_r, outer_r, *layers)
+    layer_inner, layer_outer, epsilon_r = _sorted_layers(capacitance, layers)
+    inner_r = np.broadcast_to(np.asarray(inner_r, dtype=float), capacitance.shape)
+    outer_r = np.broadcast_to(np.asarray(outer_r, dtype=float), capacitance.shape)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (len(capacitance), np.shape(radii)[-1]))
+
+    # layer of every radius: the number of layers ending below it
+    index = np.sum(layer_outer[:, None, :] < radii[..., None], axis=-1)
+    index = np.minimum(index, layer_inner.shape[1] - 1)
+    eps = np.take_along_axis(epsilon_r, index, axis=-1)
+    between = (radii >= inner_r[:, None]) & (radii <= outer_r[:, None])
+
+    charge = capacitance * np.asarray(voltage, dtype=float)
+    displacement = np.where(between, charge[:, None] / (4 * np.pi * radii**2), 0.0)
+    electric_field = displacement / (EPSILON_0 * eps)
+    return {
+        'electric_field': electric_field,
+        'displacement': displacement,
+        'energy_density': 0.5 * electric_field * displacement
+    }
+
+
+def field_profile(inner_r, outer_r, dielectrics, voltage, radii):
+    '''
+    Evaluate E(r), D(r) and the energy density of one capacitor with
+    layers given as in calculate_spherical_capacitance.
+
+    Returns:
+    - Dictionary as field_profiles, each entry of shape (R,)
+    '''
+    if dielectrics:
+        layers = layers_from_dicts(dielectrics)
+    else:
+        layers = ([inner_r], [outer_r], [1.0])
+    profiles = field_profiles(inner_r, outer_r, layers, voltage, radii)
+    return {key: value[0] for key, value in profiles.items()}
+
+
+def max_safe_voltage(inner_r, outer_r, layers, breakdown_field):
+    '''
+    Find the largest voltage at which no layer exceeds its breakdown field.
+
+    Parameters:
+    - inner_r, outer_r: Radii of the conductors (meters), shape (G,) or scalar
+    - layers: Tuple (layer_inner, layer_outer, epsilon_r), shape (G, L) or (L,)
+    - breakdown_field: Breakdown field strength of every layer (V/m),
+      shape (G, L) or (L,), in the same layer order as layers
+    Returns:
+    - Voltages (volts), shape (G,), NaN for invalid geometries
+    '''
+    capacitance, _ = layered_spherical_capacitance_batch(inner_r, outer_r, *layers)
+    layer_inner, layer_outer, epsilon_r = _sorted_layers(capacitance, layers)
+    # sort the breakdown fields together with the layers
+    breakdown = _sorted_layers(capacitance, (layers[0], layers[1], breakdown_field))[2]
+    limits = np.where(layer_outer > layer_inner,
+                      breakdown * 4 * np.pi * EPSILON_0 * epsilon_r * layer_inner**2, np.inf)
+    return np.min(limits, axis=-1) / capacitance
@@ -0,0 +1,66 @@
+'''
+field_profile_unit_test.py
+
+Unit tests for the field_profile.py module.
+'''
+
+import unittest
+import numpy as np
+from spherical_capacitor import calculate_spherical_capacitance, EPSILON_0
+from field_profile import field_profile, field_profiles, max_safe_voltage
+
+
+class TestFieldProfile(unittest.TestCase):
+    '''
+    Tests for field, displacement and energy density profiles.
+    '''
+
+    def setUp(self):
+        self.dielectrics = [
+            {'epsilon_r': 2.0, 'inner_r': 0.05, 'outer_r': 0.075},
+            {'epsilon_r': 3.0, 'inner_r': 0.075, 'outer_r': 0.1}
+        ]
+
+    def test_fields_follow_gauss_law(self):
+        '''
+        Test E, D and u against Q / (4 pi r^2) in both layers and zero outside.
+        '''
+        radii = np.array([0.01, 0.06, 0.09, 0.2])
+        profile = field_profile(0.05, 0.1, self.dielectrics, 100.0, radii)
+        charge = calculate_spherical_capacitance(0.05, 0.1, self.dielectrics) * 100.0
+        displacement = charge / (4 * np.pi * radii**2) * [0, 1, 1, 0]
+        electric_field = displacement / (EPSILON_0 * np.array([1.0, 2.0, 3.0, 1.0]))
+
+        np.testing.assert_allclose(profile['displacement'], displacement, rtol=1e-12)
+        np.testing.assert_allclose(profile['electric_field'], electric_field, rtol=1e-12)
+        np.testing.assert_allclose(profile['energy_density'],
+                                   0.5 * electric_field * displacement, rtol=1e-12)
+
+    def test_field_integrates_to_voltage(self):
+        '''
+        Test that integrating E over the gap returns the applied voltage.
+        '''
+        radii = np.linspace(0.05, 0.1, 200001)
+        profile = field_profile(0.05, 0.1, self.dielectrics, 250.0, radii)
+        self.assertAlmostEqual(np.trapezoid(profile['electric_field'], radii) / 250.0, 1.0,
+                               places=5)
+
+    def test_max_safe_voltage_reaches_breakdown(self):
+        '''
+        Test that the safe voltage brings the weakest layer exactly to breakdown.
+        '''
+        rng = np.random.default_rng(2)
+        boundaries = np.sort(rng.uniform(0.01, 1.0, (500, 4)), axis=1)
+        layers = (boundaries[:, :-1], boundaries[:, 1:], rng.uniform(1.0, 10.0, (500, 3)))
+        breakdown = rng.uniform(1e6, 1e8, (500, 3))
+
+        voltage = max_safe_voltage(boundaries[:, 0], boundaries[:, -1], layers, breakdown)
+        # just inside the inner radius of every layer, where its field peaks
+        profiles = field_profiles(boundaries[:, 0], boundaries[:, -1], layers, voltage,
+                                  boundaries[:, :-1] * (1 + 1e-12))
+        ratio = profiles['electric_field'] / breakdown
+        np.testing.assert_allclose(np.max(ratio, axis=1), 1.0, rtol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+'''
+graded_unit_test.py
+
+Unit tests for the graded_capacitor.py module.
+'''
+
+import unittest
+import numpy as np
+from spherical_capacitor import calculate_spherical_capacitance, EPSILON_0
+from graded_capacitor import (graded_spherical_capacitance,
+                              graded_spherical_capacitance_batch, permittivity_profile)
+
+
+class TestGradedCapacitor(unittest.TestCase):
+    '''
+    Tests for capacitors with a continuously graded permittivity.
+    '''
+
+    def test_constant_profile_matches_single_layer(self):
+        '''
+        Test that a constant eps_r reproduces the single-layer capacitance.
+        '''
+        capacitance = graded_spherical_capacitance(0.05, 0.1, lambda r: np.full_like(r, 80.1))
+        expected = calculate_spherical_capacitance(
+            0.05, 0.1, [{'epsilon_r': 80.1, 'inner_r': 0.05, 'outer_r': 0.1}])
+        self.assertAlmostEqual(capacitance / expected, 1.0, places=12)
+
+    def test_linear_profile_against_closed_form(self):
+        '''
+        Test eps_r = alpha + beta r, given as a table, against the exact integral.
+        '''
+        alpha, beta, inner_r, outer_r = 2.0, 40.0, 0.05, 0.2
+
+        def antiderivative(r):
+            return (-1 / (alpha * r) - beta / alpha**2 * np.log(r)
+                    + beta / alpha**2 * np.log(alpha + beta * r))
+
+        table = (np.array([0.0, 1.0]), np.array([alpha, alpha + beta]))
+        capacitance = graded_spherical_capacitance(inner_r, outer_r, table, rtol=1e-12)
+        expected = 4 * np.pi * EPSILON_0 / (antiderivative(outer_r) - antiderivative(inner_r))
+        self.assertAlmostEqual(capacitance / expected, 1.0, places=10)
+
+    def test_batch_matches_scalar_and_results_are_memoized(self):
+        '''
+        Test the vectorised path and the per-profile memo.
+        '''
+        calls = []
+
+        def profile(r):
+            calls.append(r.size)
+            return 1 + 10 * np.exp(-((r - 0.3) / 0.05) ** 2)
+
+        inner_r = np.linspace(0.1, 0.4, 50)
+        outer_r = inner_r + 0.2
+        batch = graded_spherical_capacitance_batch(inner_r, outer_r, profile)
+        single = graded_spherical_capacitance(inner_r[7], outer_r[7], profile)
+        self.assertAlmostEqual(batch[7] / single, 1.0, places=9)
+
+        num_calls = len(calls)
+        self.assertEqual(graded_spherical_capacitance(inner_r[7], outer_r[7], profile), single)
+        self.assertEqual(len(calls), num_calls)
+
+    def test_equal_tables_share_a_profile(self):
+        '''
+        Test that equal tables map to the same profile function.
+        '''
+        first = permittivity_profile(([0.1, 0.2], [1.0, 3.0]))
+        second = permittivity_profile((np.array([0.1, 0.2]), np.array([1.0, 3.0])))
+        self.assertIs(first, second)
+
+    def test_invalid_input_raises(self):
+        '''
+        Test radii and permittivity checks.
+        '''
+        with self.assertRaises(ValueError):
+            graded_spherical_capacitance(0.1, 0.05, np.ones_like)
+        with self.assertRaises(ValueError):
+            graded_spherical_capacitance_batch([0.05], [0.1], lambda r: 1 - 20 * r)
+
+
+if __name__ == '__main__':
+    unittest.main()
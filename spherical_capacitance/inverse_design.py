@@ -0,0 +1,210 @@
+"""
+This module solves the inverse problem of layered_capacitor.py: which
+layer geometry or permittivity gives a target capacitance?
+
+Every design problem fixes all but one quantity and solves
+
+    S(x) = 4 pi eps_0 / C_target,   S = sum_i (1/r1_i - 1/r2_i) / eps_i
+
+for the free quantity x within bounds. Thousands of independent problems
+are solved together by a safeguarded Newton iteration: each problem keeps
+a bracket [lower, upper] on which S - S_target changes sign, takes the
+Newton step with the analytic derivative dS/dx when it stays inside the
+bracket, and bisects otherwise. Problems whose bounds do not bracket the
+target are reported as infeasible instead of raising, so one bad design
+does not stop the batch.
+
+S is monotonic in an interface radius and in a permittivity, but not in
+the thickness of one layer of a stack: thickening the layer adds to its
+own term and pushes every outer layer outward, which lowers theirs. The
+thickness solver therefore scans S on SCAN_POINTS thicknesses, splits
+every scan interval in which dS/dt changes sign at the extremum of S, and
+runs the Newton iteration on the first interval that brackets the target,
+so it returns the smallest thickness that reaches it.
+
+Functions:
+- solve_interface_radius(layers, target_capacitance, index): Moves the
+  boundary between two layers.
+- solve_thickness(stack, target_capacitance, index, max_thickness): Sets
+  the thickness of one layer of a stack built outward from the inner
+  conductor.
+- solve_permittivity(layers, target_capacitance, index, bounds): Sets the
+  relative permittivity of one layer.
+
+All solvers return (values, converged), both of shape (G,); values are NaN
+where converged is False.
+"""
+import numpy as np
+from spherical_capacitor import EPSILON_0
+
+SOLVER_RTOL = 1e-12     # relative tolerance on S
+MAX_ITERATIONS = 100    # Newton/bisection iterations per solve
+SCAN_POINTS = 64        # thicknesses scanned for brackets, geometrically spaced
+
+
+def _safeguarded_newton(residual, lower, upper, rtol=SOLVER_RTOL, max_iterations=MAX_ITERATIONS):
+    # roots in [lower, upper] of residual(x) -> (value, derivative, scale), vectorised
+    ends = np.stack([residual(lower)[0], residual(upper)[0]])
+    feasible = np.sign(ends[0]) * np.sign(ends[1]) <= 0
+    rising = ends[1] > ends[0]
+    x = 0.5 * (lower + upper)
+    converged = np.zeros(len(x), dtype=bool)
+
+    for _ in range(max_iterations):
+        value, derivative, scale = residual(x)
+        converged = feasible & ((np.abs(value) <= rtol * scale)
+                                | (upper - lower <= rtol * np.abs(x)))
+        if np.all(converged | ~feasible):
+            break
+        # shrink the bracket on the side that has the same sign as value
+        above = (value > 0) == rising
+        upper = np.where(above, x, upper)
+        lower = np.where(above, lower, x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = x - value / derivative
+        x = np.where(np.isfinite(newton) & (newton > lower) & (newton < upper),
+                     newton, 0.5 * (lower + upper))
+
+    return np.where(converged, x, np.nan), converged
+
+
+def _bisect_slope(residual, lower, upper, rising):
+    # extremum of the residual between lower and upper, where its derivative changes sign
+    for _ in range(MAX_ITERATIONS):
+        middle = 0.5 * (lower + upper)
+        before = (residual(middle)[1] > 0) == rising
+        lower = np.where(before, middle, lower)
+        upper = np.where(before, upper, middle)
+        if np.all(upper - lower <= SOLVER_RTOL * upper):
+            break
+    return 0.5 * (lower + upper)
+
+
+def _first_bracket(residual, grid):
+    # first interval of the sorted grid (G, M) on which the residual changes sign,
+    # splitting intervals at extrema; returns (lower, upper, found)
+    values, slopes = (np.stack(columns, axis=1) for columns in zip(
+        *(residual(grid[:, m].copy())[:2] for m in range(grid.shape[1]))))
+    rows = np.arange(grid.shape[0])
+    crossing = np.sign(values[:, :-1]) * np.sign(values[:, 1:]) <= 0
+    found = np.any(crossing, axis=1)
+    column = np.where(found, np.argmax(crossing, axis=1), grid.shape[1] - 2)
+    lower, upper = grid[rows, column], grid[rows, column + 1]
+
+    # extrema before the first crossing can hide two roots inside one interval
+    before = np.arange(grid.shape[1] - 1) < np.where(found, column, grid.shape[1])[:, None]
+    candidates = (slopes[:, :-1] * slopes[:, 1:] < 0) & ~crossing & before
+    while np.any(candidates):
+        active = np.any(candidates, axis=1)
+        column = np.argmax(candidates, axis=1)
+        candidates[rows, column] = False
+        extremum = _bisect_slope(residual, grid[rows, column], grid[rows, column + 1],
+                                 slopes[rows, column] > 0)
+        hit = active & (np.sign(residual(extremum)[0]) * np.sign(values[rows, column]) <= 0)
+        lower = np.where(hit, grid[rows, column], lower)
+        upper = np.where(hit, extremum, upper)
+        # earlier candidates were checked first, so a hit is the first root
+        candidates[hit] = False
+        found |= hit
+    return lower, upper, found
+
+
+def _target_sum(target_capacitance):
+    # reciprocal sum S that gives the target capacitance
+    return 4 * np.pi * EPSILON_0 / np.asarray(target_capacitance, dtype=float)
+
+
+def solve_interface_radius(layers, target_capacitance, index):
+    '''
+    Move the boundary between layers index and index + 1 to reach the
+    target capacitance. layers is (layer_inner, layer_outer, epsilon_r) of
+    sorted, contiguous layers of shape (G, L), as in layered_capacitor.py.
+
+    The boundary stays between layer_inner[:, index] and
+    layer_outer[:, index + 1]. S is linear in 1/r, so the Newton
+    iteration converges in a few steps.
+
+    Returns:
+    - Boundary radii (meters) and converged flags, shape (G,)
+    '''
+    layer_inner, layer_outer, epsilon_r = (np.atleast_2d(np.asarray(a, dtype=float))
+                                           for a in layers)
+    target = _target_sum(target_capacitance)
+    terms = (1 / layer_inner - 1 / layer_outer) / epsilon_r
+    # S without the two layers next to the boundary, plus their fixed ends
+    fixed = (np.sum(terms, axis=-1) - terms[:, index] - terms[:, index + 1]
+             + 1 / (layer_inner[:, index] * epsilon_r[:, index])
+             - 1 / (layer_outer[:, index + 1] * epsilon_r[:, index + 1]))
+    slope = 1 / epsilon_r[:, index + 1] - 1 / epsilon_r[:, index]
+
+    def residual(radius):
+        value = fixed + slope / radius - target
+        return value, -slope / radius**2, target
+
+    return _safeguarded_newton(residual, layer_inner[:, index].copy(),
+                               layer_outer[:, index + 1].copy())
+
+
+def solve_thickness(stack, target_capacitance, index, max_thickness):
+    '''
+    Set the thickness of layer index of a stack built outward from the
+    inner conductor; the outer conductor sits on top of the last layer.
+
+    Parameters:
+    - stack: Tuple (inner_r, thickness, epsilon_r) of the inner conductor
+      radius (meters, shape (G,)), the layer thicknesses (meters, shape
+      (G, L); column index is ignored) and relative permittivities (G, L)
+    - target_capacitance: Target capacitances (farads), shape (G,)
+    - index: The layer to resize
+    - max_thickness: Upper bound of the thickness (meters)
+    Returns:
+    - Thicknesses (meters) and converged flags, shape (G,). S may reach
+      the target at several thicknesses; the smallest one in
+      [0, max_thickness] is returned.
+    '''
+    inner_r, thickness, epsilon_r = stack
+    thickness, epsilon_r = (np.atleast_2d(np.array(a, dtype=float))
+                            for a in (thickness, epsilon_r))
+    inner_r = np.broadcast_to(np.asarray(inner_r, dtype=float), (thickness.shape[0],))
+    target = _target_sum(target_capacitance)
+    after = np.arange(thickness.shape[1]) > index
+
+    def residual(value):
+        thickness[:, index] = value
+        radii = inner_r[:, None] + np.concatenate(
+            [np.zeros((len(value), 1)), np.cumsum(thickness, axis=-1)], axis=-1)
+        total = np.sum((1 / radii[:, :-1] - 1 / radii[:, 1:]) / epsilon_r, axis=-1)
+        # dS/dt_k = sum_{j >= k} (-[j > k] / r_j^2 + 1 / r_{j+1}^2) / eps_j
+        derivative = np.sum(np.where(np.arange(thickness.shape[1]) >= index,
+                                     (1 / radii[:, 1:]**2 - after / radii[:, :-1]**2)
+                                     / epsilon_r, 0.0), axis=-1)
+        return total - target, derivative, target
+
+    scale = np.broadcast_to(np.asarray(max_thickness, dtype=float), (thickness.shape[0],))
+    grid = scale[:, None] * np.concatenate([[0.0], np.geomspace(1e-6, 1.0, SCAN_POINTS - 1)])
+    lower, upper = _first_bracket(residual, grid)[:2]
+    return _safeguarded_newton(residual, lower, upper)
+
+
+def solve_permittivity(layers, target_capacitance, index, bounds=(1.0, 1e4)):
+    '''
+    Set the relative permittivity of layer index, within bounds
+    (eps_min, eps_max), to reach the target capacitance. layers is
+    (layer_inner, layer_outer, epsilon_r) as in solve_interface_radius.
+
+    Returns:
+    - Relative permittivities and converged flags, shape (G,)
+    '''
+    layer_inner, layer_outer, epsilon_r = (np.atleast_2d(np.asarray(a, dtype=float))
+                                           for a in layers)
+    target = _target_sum(target_capacitance)
+    terms = (1 / layer_inner - 1 / layer_outer) / epsilon_r
+    fixed = np.sum(terms, axis=-1) - terms[:, index]
+    width = 1 / layer_inner[:, index] - 1 / layer_outer[:, index]
+
+    def residual(value):
+        return fixed + width / value - target, -width / value**2, target
+
+    shape = (layer_inner.shape[0],)
+    return _safeguarded_newton(residual, np.full(shape, float(bounds[0])),
+                               np.full(shape, float(bounds[1])))
@@ -0,0 +1,79 @@
+'''
+inverse_unit_test.py
+
+Unit tests for the inverse_design.py module.
+'''
+
+import unittest
+import numpy as np
+from layered_capacitor import series_capacitance
+from inverse_design import solve_interface_radius, solve_thickness, solve_permittivity
+
+
+class TestInverseDesign(unittest.TestCase):
+    '''
+    Tests that solved designs reproduce their target capacitances.
+    '''
+
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.num_designs = 2000
+        boundaries = np.sort(rng.uniform(0.01, 1.0, (self.num_designs, 4)), axis=1)
+        self.layer_inner = boundaries[:, :-1]
+        self.layer_outer = boundaries[:, 1:]
+        self.epsilon_r = rng.uniform(1.0, 50.0, (self.num_designs, 3))
+        self.capacitance = series_capacitance(self.layer_inner, self.layer_outer, self.epsilon_r)
+
+    def test_interface_radius_recovers_known_design(self):
+        '''
+        Test that the solver finds the boundary of a known design.
+        '''
+        radius, converged = solve_interface_radius(
+            (self.layer_inner, self.layer_outer, self.epsilon_r), self.capacitance, 1)
+        self.assertTrue(np.all(converged))
+        np.testing.assert_allclose(radius, self.layer_outer[:, 1], rtol=1e-8)
+
+    def test_permittivity_recovers_known_design(self):
+        '''
+        Test that the solver finds the permittivity of a known design.
+        '''
+        epsilon, converged = solve_permittivity(
+            (self.layer_inner, self.layer_outer, self.epsilon_r), self.capacitance, 0)
+        self.assertTrue(np.all(converged))
+        np.testing.assert_allclose(epsilon, self.epsilon_r[:, 0], rtol=1e-8)
+
+    def _stack_capacitance(self, thickness):
+        radii = self.layer_inner[:, :1] + np.concatenate(
+            [np.zeros((self.num_designs, 1)), np.cumsum(thickness, axis=1)], axis=1)
+        return series_capacitance(radii[:, :-1], radii[:, 1:], self.epsilon_r)
+
+    def test_thickness_reaches_target(self):
+        '''
+        Test that every layer of a known design can be resized back to its
+        own capacitance, with a thickness no larger than the original.
+        '''
+        original = self.layer_outer - self.layer_inner
+        for index in range(3):
+            thickness = original.copy()
+            solved, converged = solve_thickness(
+                (self.layer_inner[:, 0], thickness, self.epsilon_r), self.capacitance, index,
+                max_thickness=10.0)
+            self.assertTrue(np.all(converged))
+            self.assertTrue(np.all(solved <= original[:, index] * (1 + 1e-8)))
+            thickness[:, index] = solved
+            np.testing.assert_allclose(self._stack_capacitance(thickness), self.capacitance,
+                                       rtol=1e-10)
+
+    def test_unreachable_target_is_flagged(self):
+        '''
+        Test that targets outside the bounds give NaN instead of raising.
+        '''
+        epsilon, converged = solve_permittivity(
+            (self.layer_inner[:2], self.layer_outer[:2], self.epsilon_r[:2]),
+            self.capacitance[:2] * [1.0, 1e6], 0)
+        np.testing.assert_array_equal(converged, [True, False])
+        self.assertTrue(np.isnan(epsilon[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+This module calculates the capacitance of spherical capacitors with any
+number of dielectric layers, for many capacitor geometries at once.
+
+For concentric layers i with radii r1_i < r2_i and relative permittivity
+eps_i, the layers act as capacitors in series:
+
+    1/C = 1/(4 pi eps_0) * sum_i (1/r1_i - 1/r2_i) / eps_i
+
+Layers are stored as arrays of shape (G, L) for G geometries with L layers
+each; a batch of geometries is evaluated with one sum over the layer axis.
+Layers must tile the gap between inner and outer radius without gaps or
+overlaps. Geometries with fewer layers are padded with zero-thickness
+layers at the outer radius, which add nothing to the sum.
+
+Functions:
+- layers_from_dicts(dielectrics): Converts the layer dictionaries used by
+  calculate_spherical_capacitance into arrays.
+- sort_layers(layer_inner, layer_outer, epsilon_r): Sorts every geometry's
+  layers by inner radius.
+- layer_error_codes(...): Vectorised contiguity and containment checks,
+  one error code per geometry.
+- validate_layers(...): Raises ValueError for the first violated rule.
+- series_capacitance(layer_inner, layer_outer, epsilon_r): The sum above,
+  without validation.
+- layered_spherical_capacitance(...): Sorts, validates and evaluates.
+- layered_spherical_capacitance_batch(...): Never raises for bad rows;
+  returns NaN and an error code for them instead.
+"""
+import numpy as np
+from spherical_capacitor import EPSILON_0
+
+RADIUS_RTOL = 1e-9  # relative tolerance for touching layer boundaries
+
+# error codes of layer_error_codes, in the order the rules are checked
+VALID = 0
+INVALID_RADII = 1
+INVALID_RADIUS_ORDER = 2
+INVALID_LAYER_RADII = 3
+INVALID_LAYER_ORDER = 4
+LAYERS_NOT_CONTIGUOUS = 5
+LAYERS_NOT_FILLING = 6
+INVALID_PERMITTIVITY = 7
+
+ERROR_MESSAGES = {
+    INVALID_RADII: "Radii must be positive numbers.",
+    INVALID_RADIUS_ORDER: "Outer radius must be greater than inner radius.",
+    INVALID_LAYER_RADII: "Dielectric layer radii must be positive numbers.",
+    INVALID_LAYER_ORDER: "Dielectric layer outer radius must not be smaller than inner radius.",
+    LAYERS_NOT_CONTIGUOUS: "Dielectric layers must be contiguous.",
+    LAYERS_NOT_FILLING: "Dielectric layers must fill the capacitor radii.",
+    INVALID_PERMITTIVITY: "Relative permittivity must be positive."
+}
+
+
+def layers_from_dicts(dielectrics):
+    '''
+    Convert a list of layer dictionaries ('epsilon_r', 'inner_r', 'outer_r')
+    into arrays (layer_inner, layer_outer, epsilon_r), each of shape (L,).
+    '''
+    layer_inner = np.array([d['inner_r'] for d in dielectrics], dtype=float)
+    layer_outer = np.array([d['outer_r'] for d in dielectrics], dtype=float)
+    epsilon_r = np.array([d.get('epsilon_r', 1.0) for d in dielectrics], dtype=float)
+    return layer_inner, layer_outer, epsilon_r
+
+
+def sort_layers(layer_inner, layer_outer, epsilon_r):
+    '''
+    Sort the layers of every geometry (last axis) by their inner radius.
+    '''
+    order = np.argsort(layer_inner, axis=-1, kind='stable')
+    return tuple(np.take_along_axis(a, order, axis=-1)
+                 for a in (layer_inner, layer_outer, epsilon_r))
+
+
+def layer_error_codes(inner_r, outer_r, layer_inner, layer_outer, epsilon_r):
+    '''
+    Check sorted layers of shape (G, L) against radii of shape (G,).
+
+    Returns:
+    - Error codes, shape (G,): VALID, or the first violated rule of
+      ERROR_MESSAGES. NaN inputs fail the rule they appear in.
+    '''
+    rules = [
+        (INVALID_RADII, (inner_r > 0) & (outer_r > 0)),
+        (INVALID_RADIUS_ORDER, outer_r > inner_r),
+        (INVALID_LAYER_RADII, np.all((layer_inner > 0) & (layer_outer > 0), axis=-1)),
+        (INVALID_LAYER_ORDER, np.all(layer_outer >= layer_inner, axis=-1)),
+        (LAYERS_NOT_CONTIGUOUS,
+         np.all(np.isclose(layer_outer[:, :-1], layer_inner[:, 1:], rtol=RADIUS_RTOL, atol=0),
+                axis=-1)),
+        (LAYERS_NOT_FILLING,
+         np.isclose(layer_inner[:, 0], inner_r, rtol=RADIUS_RTOL, atol=0)
+         & np.isclose(layer_outer[:, -1], outer_r, rtol=RADIUS_RTOL, atol=0)),
+        (INVALID_PERMITTIVITY, np.all(epsilon_r > 0, axis=-1)),
+    ]
+    codes = np.full(len(inner_r), VALID, dtype=np.int8)
+    # later rules are written first so that the first violated rule wins
+    for code, valid in reversed(rules):
+        codes[~valid] = code
+    return codes
+
+
+def validate_layers(inner_r, outer_r, layer_inner, layer_outer, epsilon_r):
+    '''
+    Check sorted layers of shape (G, L) against radii of shape (G,).
+
+    Raises:
+    - ValueError naming the first violated rule and the number of
+      geometries that violate it.
+    '''
+    codes = layer_error_codes(inner_r, outer_r, layer_inner, layer_outer, epsilon_r)
+    for code, message in ERROR_MESSAGES.items():
+        bad = np.count_nonzero(codes == code)
+        if bad:
+            raise ValueError(f"{message} ({bad} invalid geometries)")
+
+
+def series_capacitance(layer_inner, layer_outer, epsilon_r):
+    '''
+    Capacitance (farads) of concentric layers in series, summed over the
+    last axis. No validation is done.
+    '''
+    reciprocal = np.sum((1 / layer_inner - 1 / layer_outer) / epsilon_r, axis=-1)
+    return 4 * np.pi * EPSILON_0 / reciprocal
+
+
+def _prepare_layers(inner_r, outer_r, layer_inner, layer_outer, epsilon_r):
+    # broadcasts radii to (G,) and layers to (G, L), sorted by inner radius
+    layer_inner, layer_outer, epsilon_r = np.broadcast_arrays(
+        *(np.atleast_2d(np.asarray(a, dtype=float)) for a in (layer_inner, layer_outer, epsilon_r)))
+    num_geometries = max(np.size(inner_r), np.size(outer_r), layer_inner.shape[0])
+    inner_r = np.broadcast_to(np.asarray(inner_r, dtype=float), (num_geometries,))
+    outer_r = np.broadcast_to(np.asarray(outer_r, dtype=float), (num_geometries,))
+    shape = (num_geometries, layer_inner.shape[1])
+    layer_inner, layer_outer, epsilon_r = (np.broadcast_to(a, shape)
+                                           for a in (layer_inner, layer_outer, epsilon_r))
+
+    if shape[1] == 0:
+        # no dielectric layers: vacuum between the conductors
+        layer_inner, layer_outer = inner_r[:, None], outer_r[:, None]
+        epsilon_r = np.ones((shape[0], 1))
+
+    return (inner_r, outer_r) + sort_layers(layer_inner, layer_outer, epsilon_r)
+
+
+def layered_spherical_capacitance(inner_r, outer_r, layer_inner, layer_outer, epsilon_r):
+    '''
+    Calculate the capacitance of G spherical capacitors with L layers each.
+
+    Parameters:
+    - inner_r, outer_r: Radii of the conductors (meters), shape (G,) or scalar
+    - layer_inner, layer_outer: Layer radii (meters), shape (G, L) or (L,)
+    - epsilon_r: Relative permittivity of the layers, shape (G, L) or (L,)
+    Returns:
+    - Capacitances (farads), shape (G,)
+    '''
+    prepared = _prepare_layers(inner_r, outer_r, layer_inner, layer_outer, epsilon_r)
+    validate_layers(*prepared)
+    return series_capacitance(*prepared[2:])
+
+
+def layered_spherical_capacitance_batch(inner_r, outer_r, layer_inner, layer_outer, epsilon_r):
+    '''
+    Calculate capacitances like layered_spherical_capacitance, but without
+    raising for invalid geometries; only the valid rows are evaluated.
+
+    Returns:
+    - Capacitances (farads), shape (G,), NaN for invalid geometries
+    - Error codes, shape (G,), VALID or a key of ERROR_MESSAGES
+    '''
+    inner_r, outer_r, layer_inner, layer_outer, epsilon_r = _prepare_layers(
+        inner_r, outer_r, layer_inner, layer_outer, epsilon_r)
+    codes = layer_error_codes(inner_r, outer_r, layer_inner, layer_outer, epsilon_r)
+    valid = codes == VALID
+    capacitance = np.full(len(codes), np.nan)
+    capacitance[valid] = series_capacitance(layer_inner[valid], layer_outer[valid],
+                                            epsilon_r[valid])
+    return capacitance, codes
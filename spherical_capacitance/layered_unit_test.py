@@ -0,0 +1,108 @@
+'''
+layered_unit_test.py
+
+Unit tests for the layered_capacitor.py module.
+'''
+
+import unittest
+import numpy as np
+from spherical_capacitor import calculate_spherical_capacitance, EPSILON_0
+from layered_capacitor import (layers_from_dicts, layered_spherical_capacitance,
+                               layered_spherical_capacitance_batch, series_capacitance,
+                               VALID, INVALID_RADII, INVALID_RADIUS_ORDER,
+                               LAYERS_NOT_CONTIGUOUS, LAYERS_NOT_FILLING, INVALID_PERMITTIVITY)
+
+
+class TestLayeredCapacitor(unittest.TestCase):
+    '''
+    Tests for capacitors with any number of layers and batches of geometries.
+    '''
+
+    def test_three_layers_match_dictionary_api(self):
+        '''
+        Test three layers against calculate_spherical_capacitance.
+        '''
+        dielectrics = [
+            {'epsilon_r': 5.8, 'inner_r': 0.08, 'outer_r': 0.1},
+            {'epsilon_r': 1.0, 'inner_r': 0.05, 'outer_r': 0.06},
+            {'epsilon_r': 11.7, 'inner_r': 0.06, 'outer_r': 0.08}
+        ]
+        expected = calculate_spherical_capacitance(0.05, 0.1, dielectrics)
+        capacitance = layered_spherical_capacitance(0.05, 0.1, *layers_from_dicts(dielectrics))
+
+        self.assertEqual(capacitance.shape, (1,))
+        self.assertAlmostEqual(capacitance[0] / expected, 1.0, places=12)
+
+    def test_batch_with_padding_matches_single_geometries(self):
+        '''
+        Test a batch of random geometries, some padded with empty layers.
+        '''
+        rng = np.random.default_rng(0)
+        num_geometries, num_layers = 1000, 6
+        boundaries = np.sort(rng.uniform(0.01, 1.0, (num_geometries, num_layers + 1)), axis=1)
+        layer_inner, layer_outer = boundaries[:, :-1].copy(), boundaries[:, 1:].copy()
+        epsilon_r = rng.uniform(1.0, 80.0, (num_geometries, num_layers))
+        # the first half of the batch only uses three layers
+        layer_inner[:500, 3:] = boundaries[:500, -1:]
+        layer_outer[:500, 2:] = boundaries[:500, -1:]
+
+        capacitance = layered_spherical_capacitance(boundaries[:, 0], boundaries[:, -1],
+                                                    layer_inner, layer_outer, epsilon_r)
+
+        for g in (0, 499, 500, 999):
+            layers = [{'epsilon_r': e, 'inner_r': a, 'outer_r': b}
+                      for a, b, e in zip(layer_inner[g], layer_outer[g], epsilon_r[g]) if b > a]
+            expected = calculate_spherical_capacitance(boundaries[g, 0], boundaries[g, -1], layers)
+            self.assertAlmostEqual(capacitance[g] / expected, 1.0, places=12)
+
+    def test_no_layers_is_vacuum(self):
+        '''
+        Test that an empty layer axis gives the vacuum capacitance.
+        '''
+        capacitance = layered_spherical_capacitance([0.05, 0.1], [0.1, 0.3],
+                                                    np.empty((2, 0)), np.empty((2, 0)),
+                                                    np.empty((2, 0)))
+        expected = 4 * np.pi * EPSILON_0 * np.array([0.05 * 0.1 / 0.05, 0.1 * 0.3 / 0.2])
+        np.testing.assert_allclose(capacitance, expected, rtol=1e-12)
+        np.testing.assert_allclose(series_capacitance(np.array([0.05]), np.array([0.1]),
+                                                      np.array([1.0])), expected[0], rtol=1e-12)
+
+    def test_invalid_layers_raise(self):
+        '''
+        Test that gaps, overlaps and layers outside the radii raise ValueError.
+        '''
+        cases = [
+            ([0.05, 0.07], [0.06, 0.1]),    # gap between the layers
+            ([0.05, 0.06], [0.07, 0.1]),    # overlapping layers
+            ([0.05, 0.07], [0.07, 0.12]),   # layer outside the outer radius
+        ]
+        for layer_inner, layer_outer in cases:
+            with self.assertRaises(ValueError):
+                layered_spherical_capacitance(0.05, 0.1, layer_inner, layer_outer, [2.0, 3.0])
+
+    def test_batch_flags_bad_rows_without_raising(self):
+        '''
+        Test that invalid rows get NaN and their error code, valid rows a value.
+        '''
+        inner_r = np.array([0.05, -0.05, 0.1, 0.05, 0.05, 0.05, np.nan])
+        outer_r = np.array([0.1, 0.1, 0.05, 0.1, 0.1, 0.1, 0.1])
+        layer_inner = np.array([[0.05, 0.07]] * 7)
+        layer_outer = np.array([[0.07, 0.1]] * 7)
+        epsilon_r = np.array([[2.0, 3.0]] * 7)
+        layer_inner[3, 1] = 0.08
+        layer_outer[4, 1] = 0.09
+        epsilon_r[5, 0] = 0.0
+
+        capacitance, codes = layered_spherical_capacitance_batch(
+            inner_r, outer_r, layer_inner, layer_outer, epsilon_r)
+
+        np.testing.assert_array_equal(codes, [VALID, INVALID_RADII, INVALID_RADIUS_ORDER,
+                                              LAYERS_NOT_CONTIGUOUS, LAYERS_NOT_FILLING,
+                                              INVALID_PERMITTIVITY, INVALID_RADII])
+        self.assertAlmostEqual(capacitance[0] / layered_spherical_capacitance(
+            0.05, 0.1, layer_inner[0], layer_outer[0], epsilon_r[0])[0], 1.0, places=12)
+        self.assertTrue(np.all(np.isnan(capacitance[1:])))
+
+
+if __name__ == '__main__':
+    unittest.main()
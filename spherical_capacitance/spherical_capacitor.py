@@ -1,11 +1,14 @@
 """
 This module calculates the capacitance of a spherical capacitor 
-with optionally specified dielectrics (up to 2 layers).
+with optionally specified dielectric layers.
 
 Functions:
 - calculate_spherical_capacitance(inner_r, outer_r, dielectrics): 
   Calculates the capacitance with specified dielectrics.
 
+Batches of geometries with layers stored as arrays are handled by
+layered_capacitor.py.
+
 Functional programming concepts used:
 - Lambda functions
 - The `reduce` function
@@ -23,7 +26,7 @@ def calculate_spherical_capacitance(inner_r, outer_r, dielectrics):
     Parameters:
     - inner_r: Inner radius (meters), inner_r > 0
     - outer_r: Outer radius (meters), outer_r > inner_r
-    - dielectrics: List of dictionaries, each containing:
+    - dielectrics: List of any number of dictionaries, each containing:
         - 'epsilon_r': Relative permittivity (dimensionless)
         - 'inner_r': Inner radius of the dielectric layer (meters)
         - 'outer_r': Outer radius of the dielectric layer (meters)
@@ -34,8 +37,6 @@ def calculate_spherical_capacitance(inner_r, outer_r, dielectrics):
         raise ValueError("Radii must be positive numbers.")
     if outer_r <= inner_r:
         raise ValueError("Outer radius must be greater than inner radius.")
-    if len(dielectrics) > 2:
-        raise ValueError("At most 2 dielectrics are supported.")
 
     # If no dielectrics are specified, assume vacuum
     if not dielectrics:
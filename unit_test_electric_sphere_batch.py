@@ -0,0 +1,76 @@
+"""This unit test script checks the batch command for sphere
+fields with every input and output format"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+from electricSphere import elec_field_points
+from electric_sphere_batch import main
+
+class TestElectricSphereBatch(unittest.TestCase):
+    """
+    Unit tests for the electric_sphere_batch command.
+    """
+
+    def setUp(self):
+        self.directory=tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.points=np.random.default_rng(5).normal(size=(1000,3))*4
+        self.expected=elec_field_points(np.array([1,0,0]),2,3,self.points)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def run_batch(self,input_name,fmt):
+        """
+        Runs the command with small chunks and returns the output path.
+        """
+        output=os.path.join(self.directory.name,"fields."+fmt)
+        report=main([os.path.join(self.directory.name,input_name),output,"--origin","1","0","0",
+                     "--charge-density","2","--radius","3","--format",fmt,
+                     "--chunk","300","--quiet"])
+        assert report["points"]==len(self.points)
+        return output
+
+    def test_npy_to_npy(self):
+        """
+        Test .npy input and output.
+        """
+        np.save(os.path.join(self.directory.name,"points.npy"),self.points)
+        output=self.run_batch("points.npy","npy")
+        np.testing.assert_allclose(np.load(output),self.expected,rtol=1e-15)
+
+    def test_raw_to_raw_and_csv(self):
+        """
+        Test raw float64 input with raw and CSV output.
+        """
+        self.points.tofile(os.path.join(self.directory.name,"points.bin"))
+        output=self.run_batch("points.bin","raw")
+        np.testing.assert_allclose(np.fromfile(output).reshape(-1,3),self.expected,rtol=1e-15)
+        output=self.run_batch("points.bin","csv")
+        np.testing.assert_allclose(np.loadtxt(output,delimiter=",",skiprows=1),
+                                   self.expected,rtol=1e-15)
+
+    def test_empty_raw_file(self):
+        """
+        Test that an empty raw input gives an empty output.
+        """
+        with open(os.path.join(self.directory.name,"points.bin"),"wb"):
+            pass
+        self.points=np.empty((0,3))
+        output=self.run_batch("points.bin","npy")
+        self.assertEqual(np.load(output).shape,(0,3))
+
+    def test_chunk_must_be_positive(self):
+        """
+        Test that --chunk below 1 is rejected by the argument parser.
+        """
+        np.save(os.path.join(self.directory.name,"points.npy"),self.points)
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main([os.path.join(self.directory.name,"points.npy"),
+                  os.path.join(self.directory.name,"fields.npy"),"--chunk","0"])
+
+if __name__=="__main__":
+    unittest.main()
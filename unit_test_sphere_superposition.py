@@ -0,0 +1,75 @@
+"""This unit test script checks the many-sphere field evaluator
+against a direct sum over electricSphere fields, and the
+classification of points inside the spheres"""
+
+import unittest
+import numpy as np
+from electricSphere import elec_field_points
+from sphere_superposition import SphereGrid
+
+class TestSphereSuperposition(unittest.TestCase):
+    """
+    Unit tests for the SphereGrid index.
+    """
+
+    def setUp(self):
+        rng=np.random.default_rng(4)
+        self.centers=rng.uniform(0,10,(2000,3))
+        self.cd=rng.uniform(0.5,2.0,2000)
+        self.r=rng.uniform(0.05,0.3,2000)
+        self.points=rng.uniform(-2,12,(300,3))
+        self.expected=sum(elec_field_points(c,q,a,self.points)
+                          for c,q,a in zip(self.centers,self.cd,self.r))
+
+    def test_exact_sum(self):
+        """
+        Test that theta = 0 reproduces the direct sum over all spheres.
+        """
+        grid=SphereGrid(self.centers,self.cd,self.r)
+        np.testing.assert_allclose(grid.field(self.points),self.expected,rtol=1e-9,
+                                   atol=1e-9*np.max(np.abs(self.expected)))
+
+    def test_point_charge_approximation(self):
+        """
+        Test that distant cells as point charges stay accurate for a small theta.
+        """
+        grid=SphereGrid(self.centers,self.cd,self.r)
+        approx=grid.field(self.points,theta=0.3)
+        error=np.linalg.norm(approx-self.expected,axis=1)/np.linalg.norm(self.expected,axis=1)
+        assert np.max(error)<1e-2
+
+    def test_containing(self):
+        """
+        Test inside/outside classification against a brute-force check.
+        """
+        grid=SphereGrid(self.centers,self.cd,self.r)
+        points=np.vstack([self.points,self.centers[:50]+0.01])
+        found=grid.containing(points)
+        dist=np.linalg.norm(points[:,None,:]-self.centers[None],axis=2)
+        np.testing.assert_array_equal(found>=0,np.any(dist<=self.r,axis=1))
+        inside=found>=0
+        assert np.all(np.linalg.norm(points[inside]-grid.centers[found[inside]],axis=1)
+                      <=grid.r[found[inside]])
+
+    def test_containing_large_spheres(self):
+        """
+        Test that spheres much larger than a cell are found from distant cells.
+        """
+        r=self.r.copy()
+        r[:5]=2.5
+        grid=SphereGrid(self.centers,self.cd,r)
+        found=grid.containing(self.points)
+        dist=np.linalg.norm(self.points[:,None,:]-self.centers[None],axis=2)
+        np.testing.assert_array_equal(found>=0,np.any(dist<=r,axis=1))
+
+    def test_theta_range(self):
+        """
+        Test that opening parameters outside [0, 1) are rejected.
+        """
+        grid=SphereGrid(self.centers,self.cd,self.r)
+        for theta in (-0.1,1.0,2.0):
+            with self.assertRaises(ValueError):
+                grid.field(self.points,theta=theta)
+
+if __name__=="__main__":
+    unittest.main()